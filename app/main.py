@@ -8,21 +8,27 @@ Run with:
     python3 -m uvicorn app.main:app --host 0.0.0.0 --port 8000
 """
 
-import json
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, FrozenSet, List
 
+import orjson
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from app.models import RulesConfig
 from app.routes import audit, rules, screening, transactions
 from app.screening.engine import ScreeningEngine
-from app.storage.memory import MemoryStore
+from app.screening.parallel import create_pool
+from app.storage.memory import MemoryStore, history_retention
 
 # Resolve the data/ directory relative to this file so the server works
 # regardless of which directory uvicorn is launched from.
 DATA_DIR = Path(__file__).parent.parent / "data"
 
+# Most recent audit entries kept in memory; older ones are dropped so a
+# long-running server's audit log stays bounded
+AUDIT_LOG_LIMIT = 500_000
+
 app = FastAPI(
     title="Remessas Global Payment Screening API",
     description=(
@@ -31,6 +37,9 @@ app = FastAPI(
         "large amounts, and structuring patterns."
     ),
     version="1.0.0",
+    # orjson serializes datetimes and nested lists natively, which keeps
+    # large batch and audit responses cheap to encode.
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -38,24 +47,38 @@ app = FastAPI(
 async def startup() -> None:
     """Load reference data and initialize the screening engine."""
 
+    # Reference files are read as bytes and parsed with orjson, which is
+    # much faster than the json module for large lists like full SDN exports.
+
     # Load the sanctions list (list of sanctioned entity names)
-    with open(DATA_DIR / "sanctions_list.json", "r") as f:
-        sanctions_list: List[str] = json.load(f)
+    sanctions_list: List[str] = orjson.loads(
+        (DATA_DIR / "sanctions_list.json").read_bytes()
+    )
 
-    # Load high-risk country codes (ISO 3166-1 alpha-2)
-    with open(DATA_DIR / "high_risk_countries.json", "r") as f:
-        high_risk_countries: Set[str] = set(json.load(f))
+    # Load high-risk country codes (ISO 3166-1 alpha-2), uppercased once
+    # here to match how check_country normalizes the destination
+    high_risk_countries: FrozenSet[str] = frozenset(
+        code.strip().upper()
+        for code in orjson.loads((DATA_DIR / "high_risk_countries.json").read_bytes())
+    )
 
-    # Load tunable rule thresholds (or use defaults)
+    # Load tunable rule thresholds (or use defaults). Pydantic parses and
+    # validates the raw JSON in one pass.
     rules_config_path = DATA_DIR / "rules_config.json"
     if rules_config_path.exists():
-        with open(rules_config_path, "r") as f:
-            config = RulesConfig(**json.load(f))
+        config = RulesConfig.model_validate_json(rules_config_path.read_bytes())
     else:
         config = RulesConfig()
 
-    # Initialize the in-memory store and screening engine
-    store = MemoryStore()
+    # Keep each sender's history for twice the longest rule window, but
+    # never less than the 24h default lookback of /api/transactions.
+    # PUT /api/rules recomputes it when the windows change.
+    store = MemoryStore(
+        retention=history_retention(config),
+        audit_limit=AUDIT_LOG_LIMIT,
+    )
+
+    # Initialize the screening engine
     engine = ScreeningEngine(
         sanctions_list=sanctions_list,
         high_risk_countries=high_risk_countries,
@@ -63,10 +86,20 @@ async def startup() -> None:
         config=config,
     )
 
+    # Worker processes for large batches; they are only started on first use
+    pool = create_pool(sanctions_list, high_risk_countries)
+
     # Attach to app state for dependency injection in routes
     app.state.engine = engine
     app.state.store = store
     app.state.config = config
+    app.state.pool = pool
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    """Stop the batch screening worker processes."""
+    app.state.pool.shutdown(cancel_futures=True)
 
 
 # Mount all API routers
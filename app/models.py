@@ -1,6 +1,14 @@
-"""Pydantic models for the payment screening API."""
+"""Pydantic models for the payment screening API.
 
-from pydantic import BaseModel
+Only incoming requests are validated. Models the service builds itself
+from already-validated data (stored transactions, audit entries,
+screening responses) are created with model_construct(). RuleResult never
+leaves the process, so it is a plain slotted dataclass.
+"""
+
+import sys
+from dataclasses import dataclass
+from pydantic import BaseModel, ConfigDict, field_validator
 from datetime import datetime
 from typing import Literal
 
@@ -14,26 +22,41 @@ class TransactionRequest(BaseModel):
     destination_country: str
     timestamp: datetime
 
+    @field_validator("currency", "destination_country")
+    @classmethod
+    def _intern(cls, value: str) -> str:
+        # Currency and country codes come from small sets and recur on
+        # every transaction; interning lets retained history and audit
+        # entries share one copy of each. Names are left alone: interned
+        # strings are never freed on CPython 3.12, so interning arbitrary
+        # client-supplied names would grow memory without bound.
+        return sys.intern(value)
+
 
 class ScreeningResponse(BaseModel):
     """Result of screening a single transaction."""
-    transaction_id: str
+    transaction_id: str  # 32 hex chars: per-process random prefix + counter
     decision: Literal["APPROVED", "DENIED", "REVIEW"]
     risk_score: int  # 0-100 cumulative risk score
     reasons: list[str]
     matched_rules: list[str]
 
 
-class RuleResult(BaseModel):
+@dataclass(slots=True, frozen=True)
+class RuleResult:
     """Output of an individual compliance rule check."""
     score_delta: int  # Points to add to cumulative risk score
-    reasons: list[str]
-    matched_rules: list[str]
+    reasons: tuple[str, ...] = ()
+    matched_rules: tuple[str, ...] = ()
+
+
+# Shared result for a rule that did not fire (immutable, so safe to reuse)
+EMPTY_RESULT = RuleResult(score_delta=0)
 
 
 class StoredTransaction(BaseModel):
     """A transaction persisted in the in-memory store for lookups."""
-    transaction_id: str
+    transaction_id: str  # 32 hex chars: per-process random prefix + counter
     sender_name: str
     recipient_name: str
     amount: float
@@ -64,9 +87,17 @@ class BatchResponse(BaseModel):
     summary: BatchSummary
 
 
+class SanctionsCacheStats(BaseModel):
+    """Hit/miss counters of the sanctions match cache (this process only)."""
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
 class AuditEntry(BaseModel):
     """Full audit trail entry linking request to decision."""
-    transaction_id: str
+    transaction_id: str  # 32 hex chars: per-process random prefix + counter
     timestamp: datetime
     request: TransactionRequest
     decision: str
@@ -76,7 +107,13 @@ class AuditEntry(BaseModel):
 
 
 class RulesConfig(BaseModel):
-    """Tunable thresholds for all screening rules."""
+    """Tunable thresholds for all screening rules.
+
+    Frozen so the engine can hold a stable snapshot; updates replace the
+    whole object rather than mutating it.
+    """
+    model_config = ConfigDict(frozen=True)
+
     velocity_threshold: int = 5
     velocity_window_minutes: int = 60
     amount_threshold: float = 2000
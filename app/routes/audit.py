@@ -17,7 +17,7 @@ def _get_store(request: Request) -> MemoryStore:
 
 
 @router.get("/audit", response_model=List[AuditEntry])
-async def get_audit_log(
+def get_audit_log(
     request: Request,
     transaction_id: Optional[str] = Query(default=None),
     from_date: Optional[datetime] = Query(default=None),
@@ -29,6 +29,9 @@ async def get_audit_log(
       - transaction_id: exact match on a specific transaction
       - from_date: entries with timestamp >= this value
       - to_date: entries with timestamp <= this value
+
+    Declared sync so FastAPI runs the store lookup in its threadpool
+    instead of on the event loop.
     """
     store = _get_store(request)
     return store.get_audit_log(
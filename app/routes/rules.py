@@ -3,6 +3,7 @@
 from fastapi import APIRouter, Request
 
 from app.models import RulesConfig
+from app.storage.memory import history_retention
 
 router = APIRouter(prefix="/api")
 
@@ -21,10 +22,13 @@ async def update_rules(
     """Update the screening rules configuration.
 
     Updates both the app-level config and the engine's config reference
-    so that subsequent screenings use the new thresholds immediately.
+    so that subsequent screenings use the new thresholds immediately, and
+    resizes the store's history retention to fit the new rule windows.
     """
     # Update the shared config on app state
     request.app.state.config = new_config
     # Also update the engine's reference so it picks up new thresholds
     request.app.state.engine.config = new_config
+    # Keep enough history for widened velocity/structuring windows
+    request.app.state.store.set_retention(history_retention(new_config))
     return new_config
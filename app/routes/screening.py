@@ -1,17 +1,29 @@
 """Screening endpoints for single and batch transaction processing."""
 
-from collections import Counter
+import asyncio
+from collections import Counter, defaultdict
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
 
-from fastapi import APIRouter, Request
+import orjson
+from fastapi import APIRouter, Request, Response
 
 from app.models import (
     BatchRequest,
     BatchResponse,
     BatchSummary,
+    RulesConfig,
+    SanctionsCacheStats,
     ScreeningResponse,
     TransactionRequest,
 )
-from app.screening.engine import ScreeningEngine
+from app.screening.engine import ScreeningEngine, StatelessResults
+from app.screening.parallel import (
+    PROCESS_POOL_MIN_BATCH,
+    create_pool,
+    run_stateless_rules_in_pool,
+)
+from app.storage.memory import normalize_key
 
 router = APIRouter(prefix="/api")
 
@@ -28,44 +40,157 @@ async def screen_transaction(
 ) -> ScreeningResponse:
     """Screen a single transaction against all compliance rules."""
     engine = _get_engine(request)
-    return engine.screen(transaction)
+    # Fuzzy matching is CPU-bound; keep it off the event loop
+    return await asyncio.to_thread(engine.screen, transaction)
+
 
+def _screen_in_order(
+    engine: ScreeningEngine,
+    transactions: list[TransactionRequest],
+    stateless: list[StatelessResults],
+    config: RulesConfig,
+) -> list[ScreeningResponse]:
+    """Screen transactions one after another on the calling thread."""
+    return [
+        engine.screen(tx, pre, config)
+        for tx, pre in zip(transactions, stateless)
+    ]
 
+
+async def _run_stateless_rules_in_pool(
+    request: Request,
+    engine: ScreeningEngine,
+    transactions: list[TransactionRequest],
+    config: RulesConfig,
+) -> list[StatelessResults]:
+    """Run the stateless rules for a batch in the app's process pool.
+
+    A pool whose worker died (e.g. OOM-killed) stays broken, so it is
+    replaced for later batches and this one runs on a thread instead.
+    """
+    pool = request.app.state.pool
+    try:
+        return await run_stateless_rules_in_pool(pool, transactions, config)
+    except BrokenProcessPool:
+        # Only the first request to see the broken pool replaces it
+        if request.app.state.pool is pool:
+            request.app.state.pool = create_pool(
+                engine.sanctions_list, engine.high_risk_countries
+            )
+            pool.shutdown(wait=False, cancel_futures=True)
+        return await asyncio.to_thread(
+            engine.run_stateless_rules_batch, transactions, config
+        )
+
+
+def _response_row(result: ScreeningResponse) -> dict[str, Any]:
+    """Plain-dict form of a screening result, ready for orjson."""
+    return {
+        "transaction_id": result.transaction_id,
+        "decision": result.decision,
+        "risk_score": result.risk_score,
+        "reasons": result.reasons,
+        "matched_rules": result.matched_rules,
+    }
+
+
+# response_model is kept for the OpenAPI schema; the handler returns the
+# encoded body itself, so FastAPI does not re-validate or re-serialize it.
 @router.post("/screening/batch", response_model=BatchResponse)
 async def screen_batch(
     batch: BatchRequest,
     request: Request,
-) -> BatchResponse:
+) -> Response:
     """Screen a batch of transactions and return aggregate summary.
 
     Each transaction is screened independently. The summary includes
     counts per decision category and the top 5 most common risk factors.
+
+    Senders are screened concurrently on worker threads. Transactions from
+    the same sender stay in submission order on a single thread, so earlier
+    ones in the batch count toward velocity and structuring for later ones.
+    The stateless rules run first for the whole batch, in the process
+    pool for large batches.
     """
     engine = _get_engine(request)
-
-    results: list[ScreeningResponse] = []
-    for tx in batch.transactions:
-        result = engine.screen(tx)
-        results.append(result)
-
-    # Count decisions
-    approved = sum(1 for r in results if r.decision == "APPROVED")
-    denied = sum(1 for r in results if r.decision == "DENIED")
-    review = sum(1 for r in results if r.decision == "REVIEW")
+    transactions = batch.transactions
+    # One config snapshot for both phases, so a concurrent PUT /api/rules
+    # cannot give a screening thresholds from two different configs
+    config = engine.config
+
+    # Run the stateless rules for the whole batch up front, so all names
+    # are scored against the sanctions list together
+    stateless: list[StatelessResults]
+    if len(transactions) >= PROCESS_POOL_MIN_BATCH:
+        stateless = await _run_stateless_rules_in_pool(
+            request, engine, transactions, config
+        )
+    else:
+        stateless = await asyncio.to_thread(
+            engine.run_stateless_rules_batch, transactions, config
+        )
+
+    # Group transaction positions by sender, preserving submission order
+    positions_by_sender: dict[str, list[int]] = defaultdict(list)
+    for i, tx in enumerate(transactions):
+        positions_by_sender[normalize_key(tx.sender_name)].append(i)
+
+    groups = list(positions_by_sender.values())
+    group_results = await asyncio.gather(*(
+        asyncio.to_thread(
+            _screen_in_order,
+            engine,
+            [transactions[i] for i in positions],
+            [stateless[i] for i in positions],
+            config,
+        )
+        for positions in groups
+    ))
+
+    # Put each result back at its transaction's position in the batch
+    by_position: dict[int, ScreeningResponse] = {}
+    for positions, screened in zip(groups, group_results):
+        by_position.update(zip(positions, screened))
+    results = [by_position[i] for i in range(len(transactions))]
+
+    # Count decisions and matched rules in a single pass over the results
+    decision_counts: Counter[str] = Counter()
+    rule_counts: Counter[str] = Counter()
+    for r in results:
+        decision_counts[r.decision] += 1
+        rule_counts.update(r.matched_rules)
 
     # Find the top 5 most common matched rules across all results
-    all_rules: list[str] = []
-    for r in results:
-        all_rules.extend(r.matched_rules)
-    rule_counts = Counter(all_rules)
     common_risk_factors = [rule for rule, _ in rule_counts.most_common(5)]
 
     summary = BatchSummary(
         total=len(results),
-        approved=approved,
-        denied=denied,
-        review=review,
+        approved=decision_counts["APPROVED"],
+        denied=decision_counts["DENIED"],
+        review=decision_counts["REVIEW"],
         common_risk_factors=common_risk_factors,
     )
 
-    return BatchResponse(results=results, summary=summary)
+    # Results are built by the engine from validated data, so encode them
+    # straight from plain dicts instead of a Pydantic dump of every row
+    content = orjson.dumps({
+        "results": [_response_row(r) for r in results],
+        "summary": summary.model_dump(),
+    })
+    return Response(content=content, media_type="application/json")
+
+
+@router.get("/screening/cache", response_model=SanctionsCacheStats)
+def sanctions_cache_stats(request: Request) -> SanctionsCacheStats:
+    """Report the sanctions match cache statistics for monitoring.
+
+    Counts cover screenings run in the API process; large batches score
+    sanctions in worker processes, which keep their own caches.
+    """
+    info = _get_engine(request).sanctions_index.cache_info()
+    return SanctionsCacheStats(
+        hits=info.hits,
+        misses=info.misses,
+        maxsize=info.maxsize,
+        currsize=info.currsize,
+    )
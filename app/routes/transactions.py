@@ -17,7 +17,7 @@ def _get_store(request: Request) -> MemoryStore:
 
 
 @router.get("/transactions/{customer_id}", response_model=List[StoredTransaction])
-async def get_customer_transactions(
+def get_customer_transactions(
     customer_id: str,
     request: Request,
     hours: int = 24,
@@ -25,7 +25,10 @@ async def get_customer_transactions(
     """Get transactions for a customer (by sender name) within the last N hours.
 
     The customer_id path parameter is used as the sender name for lookup.
-    URL-encoded names are automatically decoded by FastAPI.
+    URL-encoded names are automatically decoded by FastAPI. Declared sync
+    so the store lookup runs in FastAPI's threadpool, off the event loop.
+    History is kept for twice the longest rule window and at least 24
+    hours, so larger `hours` values return only what is still retained.
     """
     store = _get_store(request)
     since = datetime.now(timezone.utc) - timedelta(hours=hours)
@@ -8,13 +8,26 @@ Executes all 5 compliance rules in order of severity:
   5. Structuring
 
 Then aggregates results and stores the transaction for future
-velocity/structuring lookups.
+velocity/structuring lookups. A sanctions match decides the outcome on its
+own, so the remaining rules are skipped for it (the transaction and its
+audit entry are still stored).
+
+Sanctions, country and amount depend only on the request and reference
+data, so they are grouped in run_stateless_rules; batch screening can
+evaluate them up front for the whole batch (run_stateless_rules_batch,
+optionally in worker processes) and hand the results to
+ScreeningEngine.screen.
 """
 
+import itertools
+import threading
 import uuid
+from typing import AbstractSet, Optional, Sequence
 
 from app.models import (
+    EMPTY_RESULT,
     AuditEntry,
+    RuleResult,
     RulesConfig,
     ScreeningResponse,
     StoredTransaction,
@@ -22,11 +35,95 @@ from app.models import (
 )
 from app.screening.rules.amount import check_amount
 from app.screening.rules.country_risk import check_country
-from app.screening.rules.sanctions import check_sanctions
+from app.screening.rules.sanctions import (
+    Matches,
+    SanctionsIndex,
+    check_sanctions,
+)
 from app.screening.rules.structuring import check_structuring
 from app.screening.rules.velocity import check_velocity
-from app.screening.scorer import aggregate_results
-from app.storage.memory import MemoryStore
+from app.screening.scorer import TERMINAL_RULES, aggregate_results
+from app.storage.memory import MemoryStore, normalize_key
+
+# Number of locks that sender keys are hashed onto. Screenings for the same
+# sender always share a lock; unrelated senders rarely contend.
+_SENDER_LOCK_STRIPES = 64
+
+# Results of the rules that need no transaction history, in the order
+# (sanctions, country, amount)
+StatelessResults = tuple[RuleResult, RuleResult, RuleResult]
+
+
+def _is_sanctioned(sanctions_result: RuleResult) -> bool:
+    """Whether a terminal rule fired, making the decision DENIED."""
+    return not TERMINAL_RULES.isdisjoint(sanctions_result.matched_rules)
+
+
+def run_stateless_rules(
+    request: TransactionRequest,
+    sanctions_index: SanctionsIndex,
+    high_risk_countries: AbstractSet[str],
+    config: RulesConfig,
+    sanctions_matches: Optional[tuple[Matches, Matches]] = None,
+) -> StatelessResults:
+    """Run the rules that depend only on the request and reference data.
+
+    Country and amount are skipped (returned as EMPTY_RESULT) on a
+    sanctions match. `sanctions_matches` supplies the sender's and
+    recipient's sanctions index results if already looked up.
+    """
+    # Sanctions -- highest severity, instant denial
+    sanctions_result = check_sanctions(
+        sender_name=request.sender_name,
+        recipient_name=request.recipient_name,
+        sanctions_list=sanctions_index.names,
+        threshold=config.fuzzy_match_threshold,
+        index=sanctions_index,
+        matches=sanctions_matches,
+    )
+    if _is_sanctioned(sanctions_result):
+        return sanctions_result, EMPTY_RESULT, EMPTY_RESULT
+
+    return (
+        sanctions_result,
+        # Country risk -- elevated risk for high-risk jurisdictions
+        check_country(
+            destination_country=request.destination_country,
+            high_risk_countries=high_risk_countries,
+        ),
+        # Amount -- large transaction flag
+        check_amount(
+            amount=request.amount,
+            threshold=config.amount_threshold,
+        ),
+    )
+
+
+def run_stateless_rules_batch(
+    requests: Sequence[TransactionRequest],
+    sanctions_index: SanctionsIndex,
+    high_risk_countries: AbstractSet[str],
+    config: RulesConfig,
+) -> list[StatelessResults]:
+    """run_stateless_rules for many requests, in order.
+
+    All sender and recipient names are scored against the sanctions list
+    together, in one pass over the index, instead of name by name.
+    """
+    names = [r.sender_name for r in requests]
+    names += [r.recipient_name for r in requests]
+    matches = sanctions_index.match_many(names, config.fuzzy_match_threshold)
+    count = len(requests)
+    return [
+        run_stateless_rules(
+            request,
+            sanctions_index,
+            high_risk_countries,
+            config,
+            sanctions_matches=(matches[i], matches[count + i]),
+        )
+        for i, request in enumerate(requests)
+    ]
 
 
 class ScreeningEngine:
@@ -35,69 +132,139 @@ class ScreeningEngine:
     def __init__(
         self,
         sanctions_list: list[str],
-        high_risk_countries: set[str],
+        high_risk_countries: AbstractSet[str],
         store: MemoryStore,
         config: RulesConfig,
     ) -> None:
         self.sanctions_list = sanctions_list
+        # Normalize the sanctions list once instead of on every screening
+        self.sanctions_index = SanctionsIndex(sanctions_list)
         self.high_risk_countries = high_risk_countries
         self.store = store
         self.config = config
+        self._sender_locks = [
+            threading.Lock() for _ in range(_SENDER_LOCK_STRIPES)
+        ]
+        # Transaction ids are a random per-engine prefix plus a counter, so
+        # only engine creation reads the OS random source
+        self._id_prefix = uuid.uuid4().hex[:16]
+        self._id_sequence = itertools.count()
 
-    def screen(self, request: TransactionRequest) -> ScreeningResponse:
+    def _new_transaction_id(self) -> str:
+        """Return a 32-hex-char id, unique across this engine's screenings."""
+        # next() on itertools.count is atomic, so no lock is needed
+        return f"{self._id_prefix}{next(self._id_sequence):016x}"
+
+    def run_stateless_rules_batch(
+        self,
+        requests: Sequence[TransactionRequest],
+        config: Optional[RulesConfig] = None,
+    ) -> list[StatelessResults]:
+        """Run the stateless rules for a batch with this engine's data.
+
+        `config` defaults to the engine's current config.
+        """
+        return run_stateless_rules_batch(
+            requests,
+            self.sanctions_index,
+            self.high_risk_countries,
+            self.config if config is None else config,
+        )
+
+    def screen(
+        self,
+        request: TransactionRequest,
+        stateless: Optional[StatelessResults] = None,
+        config: Optional[RulesConfig] = None,
+    ) -> ScreeningResponse:
         """Screen a single transaction through all compliance rules.
 
         Runs each rule in order, aggregates the results into a final
         decision, persists the transaction, and returns the response.
+        Safe to call from multiple threads. `stateless` supplies results
+        already computed by run_stateless_rules for this request, and
+        `config` the snapshot they were computed with (defaults to the
+        engine's current config).
         """
-        transaction_id = str(uuid.uuid4())
-
-        # Execute rules in order of severity
-        rule_results = [
-            # 1. Sanctions -- highest severity, instant denial
-            check_sanctions(
-                sender_name=request.sender_name,
-                recipient_name=request.recipient_name,
-                sanctions_list=self.sanctions_list,
-                threshold=self.config.fuzzy_match_threshold,
-            ),
-            # 2. Country risk -- elevated risk for high-risk jurisdictions
-            check_country(
-                destination_country=request.destination_country,
-                high_risk_countries=self.high_risk_countries,
-            ),
-            # 3. Velocity -- unusual transaction frequency
-            check_velocity(
-                sender_name=request.sender_name,
-                store=self.store,
-                timestamp=request.timestamp,
-                threshold=self.config.velocity_threshold,
-                window_minutes=self.config.velocity_window_minutes,
-            ),
-            # 4. Amount -- large transaction flag
-            check_amount(
-                amount=request.amount,
-                threshold=self.config.amount_threshold,
-            ),
-            # 5. Structuring -- split-transaction detection
-            check_structuring(
-                sender_name=request.sender_name,
-                amount=request.amount,
-                store=self.store,
-                timestamp=request.timestamp,
-                window_minutes=self.config.structuring_window_minutes,
-                min_count=self.config.structuring_min_count,
-                amount_variance=self.config.structuring_amount_variance,
-            ),
-        ]
+        # Velocity and structuring read the sender's history before this
+        # transaction is stored, so screenings for one sender must not
+        # interleave or both would miss each other.
+        key = normalize_key(request.sender_name)
+        with self._sender_locks[hash(key) % _SENDER_LOCK_STRIPES]:
+            return self._screen(request, key, stateless, config)
+
+    def _screen(
+        self,
+        request: TransactionRequest,
+        sender_key: str,
+        stateless: Optional[StatelessResults],
+        config: Optional[RulesConfig] = None,
+    ) -> ScreeningResponse:
+        """Run the rules and persist the result (caller holds the sender lock).
+
+        `sender_key` is the normalized sender name, computed once per
+        screening and shared by the velocity/structuring lookups and storage.
+        """
+        transaction_id = self._new_transaction_id()
+
+        # Take one snapshot of the config so the whole screening uses a
+        # consistent set of thresholds even if PUT /api/rules swaps it
+        # mid-flight, and so each threshold is a local read below. Batches
+        # pass in the snapshot their stateless rules already ran with.
+        cfg = self.config if config is None else config
+        store = self.store
+
+        if stateless is None:
+            stateless = run_stateless_rules(
+                request, self.sanctions_index, self.high_risk_countries, cfg
+            )
+        sanctions_result, country_result, amount_result = stateless
+
+        if _is_sanctioned(sanctions_result):
+            # DENIED regardless of the other rules, so skip them (and the
+            # velocity/structuring history scans) entirely
+            rule_results = [sanctions_result]
+        else:
+            # Execute rules in order of severity
+            rule_results = [
+                # 1. Sanctions -- highest severity, instant denial
+                sanctions_result,
+                # 2. Country risk -- elevated risk for high-risk jurisdictions
+                country_result,
+                # 3. Velocity -- unusual transaction frequency
+                check_velocity(
+                    sender_name=request.sender_name,
+                    store=store,
+                    timestamp=request.timestamp,
+                    threshold=cfg.velocity_threshold,
+                    window_minutes=cfg.velocity_window_minutes,
+                    sender_key=sender_key,
+                ),
+                # 4. Amount -- large transaction flag
+                amount_result,
+                # 5. Structuring -- split-transaction detection
+                check_structuring(
+                    sender_name=request.sender_name,
+                    amount=request.amount,
+                    store=store,
+                    timestamp=request.timestamp,
+                    window_minutes=cfg.structuring_window_minutes,
+                    min_count=cfg.structuring_min_count,
+                    amount_variance=cfg.structuring_amount_variance,
+                    sender_key=sender_key,
+                ),
+            ]
 
         # Aggregate all rule results into a final decision
         risk_score, decision, reasons, matched_rules = aggregate_results(
             rule_results
         )
 
+        # Everything below is built from already-validated data, so the
+        # models are constructed without re-running Pydantic validation.
+
         # Persist the transaction for future velocity/structuring lookups
-        stored_tx = StoredTransaction(
+        stored_tx = StoredTransaction.model_construct(
             transaction_id=transaction_id,
             sender_name=request.sender_name,
             recipient_name=request.recipient_name,
@@ -108,10 +275,10 @@ class ScreeningEngine:
             decision=decision,
             risk_score=risk_score,
         )
-        self.store.add(stored_tx)
+        store.add(stored_tx, key=sender_key)
 
         # Record a full audit trail entry
-        audit_entry = AuditEntry(
+        audit_entry = AuditEntry.model_construct(
             transaction_id=transaction_id,
             timestamp=request.timestamp,
             request=request,
@@ -120,9 +287,9 @@ class ScreeningEngine:
             reasons=reasons,
             matched_rules=matched_rules,
         )
-        self.store.add_audit(audit_entry)
+        store.add_audit(audit_entry)
 
-        return ScreeningResponse(
+        return ScreeningResponse.model_construct(
             transaction_id=transaction_id,
             decision=decision,
             risk_score=risk_score,
@@ -0,0 +1,99 @@
+"""Process-pool fan-out for batch screening.
+
+Worker threads cannot use more than one core for the Python parts of a
+screening. For large batches, the rules that need only the request and
+reference data (sanctions, country, amount) run in worker processes.
+Velocity, structuring and persistence still run in the parent process,
+which owns the store.
+
+Workers get the reference data once through the pool initializer and keep
+it in module globals, so each shard only ships its transactions and the
+current config.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AbstractSet, Optional
+
+from app.models import RulesConfig, TransactionRequest
+from app.screening.engine import StatelessResults, run_stateless_rules_batch
+from app.screening.rules.sanctions import SanctionsIndex
+
+# Batches smaller than this are not worth the inter-process round trip
+PROCESS_POOL_MIN_BATCH = 256
+
+# Workers are started on first use, from a server that is already running
+# threads; forking a multithreaded process can deadlock, so they start from
+# a clean forkserver process instead (spawn where that is unavailable)
+_START_METHOD = (
+    "forkserver"
+    if "forkserver" in multiprocessing.get_all_start_methods()
+    else "spawn"
+)
+
+# Per-worker reference data, set by _init_worker
+_sanctions_index: Optional[SanctionsIndex] = None
+_high_risk_countries: AbstractSet[str] = frozenset()
+
+
+def _init_worker(
+    sanctions_list: list[str],
+    high_risk_countries: AbstractSet[str],
+) -> None:
+    """Build the worker's copy of the reference data."""
+    global _sanctions_index, _high_risk_countries
+    # The pool already runs one worker per core, so each scores on a
+    # single thread instead of oversubscribing the cores
+    _sanctions_index = SanctionsIndex(sanctions_list, workers=1)
+    _high_risk_countries = high_risk_countries
+
+
+def _screen_shard(
+    transactions: list[TransactionRequest],
+    config: RulesConfig,
+) -> list[StatelessResults]:
+    """Run the stateless rules for one shard inside a worker."""
+    assert _sanctions_index is not None, "worker was not initialized"
+    return run_stateless_rules_batch(
+        transactions, _sanctions_index, _high_risk_countries, config
+    )
+
+
+def create_pool(
+    sanctions_list: list[str],
+    high_risk_countries: AbstractSet[str],
+    max_workers: Optional[int] = None,
+) -> ProcessPoolExecutor:
+    """Create a process pool whose workers hold the reference data."""
+    return ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count(),
+        mp_context=multiprocessing.get_context(_START_METHOD),
+        initializer=_init_worker,
+        initargs=(sanctions_list, high_risk_countries),
+    )
+
+
+async def run_stateless_rules_in_pool(
+    pool: Executor,
+    transactions: list[TransactionRequest],
+    config: RulesConfig,
+    shards: Optional[int] = None,
+) -> list[StatelessResults]:
+    """Evaluate the stateless rules for every transaction across the pool.
+
+    Transactions are split into contiguous shards, one per worker by
+    default, and the results come back in the original order.
+    """
+    if not transactions:
+        return []
+
+    shards = shards or os.cpu_count() or 1
+    size = -(-len(transactions) // shards)  # ceiling division
+    loop = asyncio.get_running_loop()
+    shard_results = await asyncio.gather(*(
+        loop.run_in_executor(pool, _screen_shard, transactions[i:i + size], config)
+        for i in range(0, len(transactions), size)
+    ))
+    return [result for shard in shard_results for result in shard]
@@ -6,7 +6,7 @@ crime or terrorist financing, and may trigger regulatory reporting
 requirements (e.g., CTRs for amounts over $10,000 in the US).
 """
 
-from app.models import RuleResult
+from app.models import EMPTY_RESULT, RuleResult
 
 
 def check_amount(
@@ -21,11 +21,11 @@ def check_amount(
     if amount > threshold:
         return RuleResult(
             score_delta=50,
-            reasons=[
+            reasons=(
                 f"Transaction amount ${amount:.2f} exceeds "
-                f"threshold of ${threshold:.2f}"
-            ],
-            matched_rules=["LARGE_AMOUNT"],
+                f"threshold of ${threshold:.2f}",
+            ),
+            matched_rules=("LARGE_AMOUNT",),
         )
 
-    return RuleResult(score_delta=0, reasons=[], matched_rules=[])
+    return EMPTY_RESULT
@@ -6,16 +6,19 @@ international sanctions, known for terrorism financing, or with
 inadequate AML controls (per FATF grey/black lists).
 """
 
-from app.models import RuleResult
+from typing import AbstractSet
+
+from app.models import EMPTY_RESULT, RuleResult
 
 
 def check_country(
     destination_country: str,
-    high_risk_countries: set[str],
+    high_risk_countries: AbstractSet[str],
 ) -> RuleResult:
     """Check if the destination country is in the high-risk set.
 
-    Country codes are compared in uppercase (ISO 3166-1 alpha-2).
+    Country codes are compared in uppercase (ISO 3166-1 alpha-2), so
+    `high_risk_countries` must already be uppercased.
     Returns score_delta=50 if the country is high-risk, 0 otherwise.
     High-risk jurisdictions always warrant manual review per compliance policy.
     """
@@ -24,10 +27,10 @@ def check_country(
     if country_upper in high_risk_countries:
         return RuleResult(
             score_delta=50,
-            reasons=[
-                f"Destination country '{country_upper}' is a high-risk jurisdiction"
-            ],
-            matched_rules=["HIGH_RISK_COUNTRY"],
+            reasons=(
+                f"Destination country '{country_upper}' is a high-risk jurisdiction",
+            ),
+            matched_rules=("HIGH_RISK_COUNTRY",),
         )
 
-    return RuleResult(score_delta=0, reasons=[], matched_rules=[])
+    return EMPTY_RESULT
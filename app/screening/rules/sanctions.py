@@ -1,7 +1,7 @@
 """Sanctions list matching rule.
 
 Checks sender AND recipient names against a sanctions list using fuzzy
-string matching. Uses thefuzz for fuzzy matching to catch name variations
+string matching. Uses rapidfuzz for fuzzy matching to catch name variations
 like "Mohammad Ahmad" vs "Mohammed Ahmed" -- common in cross-border
 remittances where transliteration differences are frequent.
 
@@ -12,67 +12,363 @@ Two matching strategies:
 
 The higher of the two scores is used. A threshold of 85 balances catching
 real variants without generating excessive false positives.
+
+The sanctions side is normalized once into a SanctionsIndex. Per request,
+cheap length and character-count bounds discard sanctioned names that
+cannot reach the threshold, and the survivors are scored with
+rapidfuzz.process.cdist.
+Senders and recipients recur heavily in remittance traffic, so each index
+also memoizes its results per normalized name and threshold.
 """
 
 import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import NamedTuple, Optional, Sequence
 
-from thefuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
 
 from app.models import RuleResult
 
+# Characters 128-255 are dropped before token sorting, matching the
+# force_ascii preprocessing thefuzz applied to token_sort_ratio.
+_ASCII_ONLY = {i: None for i in range(128, 256)}
+
+# (position in the sanctions list, rounded similarity) for each match
+Matches = tuple[tuple[int, int], ...]
+
+# Distinct (normalized name, threshold) results kept per SanctionsIndex
+MATCH_CACHE_SIZE = 100_000
+
+# Lists shorter than this are scored in full; the per-query filter costs
+# about as much as scoring this many names with cdist
+_PREFILTER_MIN_NAMES = 1000
+
+# With this many queries at once, cdist scores several queries per SIMD
+# pass and the whole list is cheaper to score than to filter per query
+_FULL_SCORE_MIN_QUERIES = 4
+
+# Largest (queries x candidates) score matrix scored in one cdist call
+_MAX_SCORE_CELLS = 1 << 22
+
+# Characters are counted into this many buckets (by code point modulo) for
+# the prefilter. Sharing buckets only loosens the bound, never breaks it.
+_BAG_BUCKETS = 32
 
+
+# Screened names recur across transactions, so their normalized forms
+# are memoized too
+@lru_cache(maxsize=8192)
 def _normalize_name(name: str) -> str:
     """Lowercase, strip, and collapse multiple spaces."""
     return re.sub(r"\s+", " ", name.strip().lower())
 
 
+def _full_process(name: str) -> str:
+    """Strip non-alphanumerics for token sorting (thefuzz full_process)."""
+    return default_process(name.translate(_ASCII_ONLY))
+
+
+def _sort_tokens(name: str) -> str:
+    """Sort whitespace-separated tokens, as token_sort_ratio does internally."""
+    return " ".join(sorted(name.split()))
+
+
+def _char_bag(name: str) -> np.ndarray:
+    """Count the characters of a name into _BAG_BUCKETS buckets."""
+    code_points = np.frombuffer(name.encode("utf-32-le"), dtype=np.uint32)
+    return np.bincount(code_points % _BAG_BUCKETS, minlength=_BAG_BUCKETS)
+
+
+class _BagFilter:
+    """Upper bound on fuzz.ratio from lengths and shared character counts.
+
+    ratio() is 200 * LCS / (len(a) + len(b)), and the longest common
+    subsequence can never exceed the number of characters two strings have
+    in common, so any name whose bound is below the cutoff cannot match.
+    Since LCS <= min(len(a), len(b)), only names within a length window
+    around the query can match at all. Names are kept sorted by length so
+    that window is a contiguous slice, found with two binary searches,
+    and the character counts are only compared inside it.
+    """
+
+    def __init__(self, names: Sequence[str]) -> None:
+        lengths = np.array([len(n) for n in names], dtype=np.float64)
+        # Positions in the original list, in order of increasing length
+        self.order = np.argsort(lengths, kind="stable")
+        self.lengths = lengths[self.order]
+        self.bags = np.array(
+            [_char_bag(names[i]) for i in self.order], dtype=np.int64
+        ).reshape(len(names), _BAG_BUCKETS)
+
+    def _length_window(self, query_len: int, cutoff: float) -> tuple[int, int]:
+        """Slice of self.lengths whose ratio() with the query could reach cutoff."""
+        if cutoff <= 0:
+            return 0, len(self.lengths)
+        if cutoff > 100:
+            return 0, 0
+        # 200 * min(l, q) / (l + q) >= cutoff, solved for l on either side
+        min_len = cutoff * query_len / (200 - cutoff)
+        max_len = query_len * (200 - cutoff) / cutoff
+        # Small tolerance so float error in the bound never drops a match
+        lo = int(np.searchsorted(self.lengths, min_len - 1e-6, side="left"))
+        hi = int(np.searchsorted(self.lengths, max_len + 1e-6, side="right"))
+        return lo, hi
+
+    def candidates(self, query: str, cutoff: float) -> np.ndarray:
+        """Return positions of names whose ratio() with query could reach cutoff."""
+        lo, hi = self._length_window(len(query), cutoff)
+        if lo >= hi:
+            return np.empty(0, dtype=np.intp)
+        shared = np.minimum(self.bags[lo:hi], _char_bag(query)).sum(axis=1)
+        total = self.lengths[lo:hi] + len(query)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bound = np.where(total > 0, 200 * shared / total, 100.0)
+        return self.order[lo:hi][bound >= cutoff - 1e-6]
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a SanctionsIndex match cache."""
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _MatchCache:
+    """Thread-safe LRU of match results keyed by (normalized name, threshold).
+
+    A hand-rolled LRU rather than functools.lru_cache, so batch lookups
+    can check many keys first and store the results they score together.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[tuple[str, int], Matches] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: tuple[str, int]) -> Optional[Matches]:
+        """Return the cached result for key, or None on a miss."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: tuple[str, int], value: Matches) -> None:
+        """Store a result, evicting the least recently used one if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, self.maxsize, len(self._data)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = 0
+
+
+class SanctionsIndex:
+    """Sanctions list preprocessed once for repeated screening.
+
+    Holds the original names (for reporting) alongside their normalized
+    and token-sorted forms, in the same order, plus character-count
+    filters over both forms. Match results are cached per index; call
+    cache_clear() if the underlying list is ever changed in place.
+    """
+
+    def __init__(
+        self, sanctions_list: Sequence[str], workers: int = -1
+    ) -> None:
+        self.names = list(sanctions_list)
+        # Threads rapidfuzz may use when scoring several names at once
+        # (-1: one per core)
+        self.workers = workers
+        self.normalized = [_normalize_name(n) for n in self.names]
+        # token_sort_ratio is ratio() over token-sorted strings, so the
+        # sanctions side is sorted once here rather than on every comparison
+        self.token_sorted = [
+            _sort_tokens(_full_process(n)) for n in self.normalized
+        ]
+        self._ratio_filter = _BagFilter(self.normalized)
+        self._token_sort_filter = _BagFilter(self.token_sorted)
+        # Per-instance cache, so it is dropped together with the index
+        self._cache = _MatchCache(MATCH_CACHE_SIZE)
+
+    def match(self, name: str, threshold: int) -> Matches:
+        """Return (position, similarity) for every sanctioned name matching `name`.
+
+        Similarity is the higher of ratio() and token_sort_ratio(), rounded
+        to an integer, and results are in sanctions-list order. Names that
+        normalize to the same string share one cached result.
+        """
+        return self.match_many([name], threshold)[0]
+
+    def match_many(self, names: Sequence[str], threshold: int) -> list[Matches]:
+        """match() for many names at once, in the same order as `names`.
+
+        Names missing from the cache are scored together, with one
+        process.cdist call per strategy over all of them.
+        """
+        keys = [(_normalize_name(name), threshold) for name in names]
+        results: dict[tuple[str, int], Matches] = {}
+        missing: list[str] = []
+        for key in keys:
+            if key in results:
+                continue
+            cached = self._cache.get(key)
+            if cached is None:
+                # Placeholder so a repeated name is scored only once
+                results[key] = ()
+                missing.append(key[0])
+            else:
+                results[key] = cached
+
+        if missing:
+            for normalized, matches in zip(
+                missing, self._score(missing, threshold)
+            ):
+                results[(normalized, threshold)] = matches
+                self._cache.put((normalized, threshold), matches)
+
+        return [results[key] for key in keys]
+
+    def cache_info(self) -> CacheInfo:
+        """Hit/miss statistics of the match cache."""
+        return self._cache.info()
+
+    def cache_clear(self) -> None:
+        """Drop all cached match results."""
+        self._cache.clear()
+
+    def _score(self, queries: list[str], threshold: int) -> list[Matches]:
+        """Score already-normalized names against the whole list."""
+        token_sorted = [_sort_tokens(_full_process(q)) for q in queries]
+
+        # Scores are reported as rounded integers, so anything that can
+        # round up to the threshold must survive the cutoff.
+        cutoff = max(threshold - 0.5, 0)
+
+        # Best score per (query, sanctions position) above the cutoff
+        best: list[dict[int, float]] = [{} for _ in queries]
+
+        # Use the higher of two fuzzy matching strategies:
+        # ratio() for overall similarity, and ratio() over token-sorted
+        # forms -- equivalent to token_sort_ratio() -- for reordered tokens
+        for strategy_queries, choices, bag_filter in (
+            (queries, self.normalized, self._ratio_filter),
+            (token_sorted, self.token_sorted, self._token_sort_filter),
+        ):
+            if (
+                len(choices) < _PREFILTER_MIN_NAMES
+                or len(strategy_queries) >= _FULL_SCORE_MIN_QUERIES
+            ):
+                # Scoring the whole list outright beats filtering it
+                candidates = np.arange(len(choices))
+            else:
+                # Only names that survive the filter for at least one query
+                # are scored; extra pairs are scored exactly, so harmless
+                candidates = np.unique(np.concatenate([
+                    bag_filter.candidates(q, cutoff) for q in strategy_queries
+                ]).astype(np.intp))
+            if candidates.size == 0:
+                continue
+            candidate_names = [choices[i] for i in candidates]
+            # Score the queries in chunks to bound the score matrix size
+            chunk = max(1, _MAX_SCORE_CELLS // candidates.size)
+            for start in range(0, len(strategy_queries), chunk):
+                scores = process.cdist(
+                    strategy_queries[start:start + chunk],
+                    candidate_names,
+                    scorer=fuzz.ratio,
+                    score_cutoff=cutoff,
+                    dtype=np.float32,
+                    workers=self.workers if len(strategy_queries) > 1 else 1,
+                )
+                rows, cols = np.nonzero(scores >= cutoff)
+                for row, col in zip(rows.tolist(), cols.tolist()):
+                    position = int(candidates[col])
+                    score = float(scores[row, col])
+                    row_best = best[start + row]
+                    if score > row_best.get(position, -1.0):
+                        row_best[position] = score
+
+        results: list[Matches] = []
+        for row_scores in best:
+            matches: list[tuple[int, int]] = []
+            for position in sorted(row_scores):
+                score = int(round(row_scores[position]))
+                if score >= threshold:
+                    matches.append((position, score))
+            # Immutable, since the same result is handed to every cache hit
+            results.append(tuple(matches))
+        return results
+
+
 def check_sanctions(
     sender_name: str,
     recipient_name: str,
     sanctions_list: list[str],
     threshold: int = 85,
+    index: Optional[SanctionsIndex] = None,
+    matches: Optional[tuple[Matches, Matches]] = None,
 ) -> RuleResult:
     """Screen sender and recipient names against the sanctions list.
 
     Returns a RuleResult with score_delta=100 if any name matches a
     sanctioned entity above the similarity threshold, or score_delta=0
-    if no match is found.
+    if no match is found. Pass a prebuilt `index` to skip normalizing
+    the sanctions list on every call, and `matches` with the sender's
+    and recipient's index results if they were already looked up (e.g.
+    by SanctionsIndex.match_many for a whole batch).
     """
     reasons: list[str] = []
     matched_rules: list[str] = []
 
-    # Check both sender and recipient against every sanctioned name
+    if index is None:
+        index = SanctionsIndex(sanctions_list)
+    if matches is None:
+        # Check both sender and recipient against every sanctioned name
+        matches = (
+            index.match(sender_name, threshold),
+            index.match(recipient_name, threshold),
+        )
+
     names_to_check = [
-        ("Sender", sender_name),
-        ("Recipient", recipient_name),
+        ("Sender", sender_name, matches[0]),
+        ("Recipient", recipient_name, matches[1]),
     ]
 
-    for role, name in names_to_check:
-        normalized_name = _normalize_name(name)
-        for sanctioned in sanctions_list:
-            normalized_sanctioned = _normalize_name(sanctioned)
-
-            # Use the higher of two fuzzy matching strategies:
-            # ratio() for overall similarity, token_sort_ratio() for reordered tokens
-            score = max(
-                fuzz.ratio(normalized_name, normalized_sanctioned),
-                fuzz.token_sort_ratio(normalized_name, normalized_sanctioned),
+    for role, name, name_matches in names_to_check:
+        for position, score in name_matches:
+            reasons.append(
+                f"{role} '{name}' matches sanctioned entity "
+                f"'{index.names[position]}' (similarity: {score}%)"
             )
-
-            if score >= threshold:
-                reasons.append(
-                    f"{role} '{name}' matches sanctioned entity "
-                    f"'{sanctioned}' (similarity: {score}%)"
-                )
-                # Only add the rule tag once, even if multiple names match
-                if "SANCTIONS_MATCH" not in matched_rules:
-                    matched_rules.append("SANCTIONS_MATCH")
+            # Only add the rule tag once, even if multiple names match
+            if "SANCTIONS_MATCH" not in matched_rules:
+                matched_rules.append("SANCTIONS_MATCH")
 
     # Sanctions match is an instant denial -- score_delta of 100
     score_delta = 100 if matched_rules else 0
 
     return RuleResult(
         score_delta=score_delta,
-        reasons=reasons,
-        matched_rules=matched_rules,
+        reasons=tuple(reasons),
+        matched_rules=tuple(matched_rules),
     )
@@ -8,13 +8,51 @@ We look for 3+ transactions from the same sender within a time window
 where all amounts are within 20% of each other -- indicating deliberate
 splitting. The algorithm finds the largest cluster of similar amounts
 by checking, for each amount, how many others fall within +/-20% of it.
+Amounts are sorted once so each of those counts is a pair of binary
+searches, making the check O(n log n) rather than O(n^2).
+
+The cluster bounds are computed in integer cents with the variance as an
+exact fraction, so an amount exactly 20% away from a center is always
+inside its cluster (float products like 35 * 0.8 land just above 28).
+Amounts too large for that (or inf/nan) fall back to comparing floats.
 """
 
+import math
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
+from typing import Optional
 
-from app.models import RuleResult
+from app.models import EMPTY_RESULT, RuleResult
 from app.storage.memory import MemoryStore
 
+# The variance is applied as an integer fraction in parts per million
+_PPM = 1_000_000
+
+
+def _bounds(center: int, variance_ppm: int) -> tuple[int, int]:
+    """Smallest and largest amounts (in cents) within variance of center."""
+    lower = -(-center * (_PPM - variance_ppm) // _PPM)  # ceiling division
+    upper = center * (_PPM + variance_ppm) // _PPM
+    return lower, upper
+
+
+def _largest_cluster(
+    amounts: list[float], amount_variance: float
+) -> list[float]:
+    """Largest cluster of amounts within variance of one of them, in floats.
+
+    The quadratic float comparison used when some amount has no finite
+    value in cents.
+    """
+    best: list[float] = []
+    for center in amounts:
+        lower = center * (1 - amount_variance)
+        upper = center * (1 + amount_variance)
+        cluster = [a for a in amounts if lower <= a <= upper]
+        if len(cluster) > len(best):
+            best = cluster
+    return best
+
 
 def check_structuring(
     sender_name: str,
@@ -24,52 +62,72 @@ def check_structuring(
     window_minutes: int = 30,
     min_count: int = 3,
     amount_variance: float = 0.20,
+    sender_key: Optional[str] = None,
 ) -> RuleResult:
     """Detect potential transaction structuring by the sender.
 
     Retrieves recent transactions within the time window, includes the
     current transaction amount, and checks whether any cluster of
     `min_count` or more amounts are all within `amount_variance` (20%)
-    of each other.
+    of each other. `sender_key` is the store's normalized form of
+    `sender_name`, if already computed.
     """
     # Lookback window for related transactions
     window_start = timestamp - timedelta(minutes=window_minutes)
-    recent_txns = store.get_by_sender(sender_name, since=window_start)
+    all_amounts = store.get_amounts_by_sender(
+        sender_name, since=window_start, key=sender_key
+    )
 
     # Combine historical amounts with the current transaction amount
-    all_amounts = [t.amount for t in recent_txns] + [amount]
+    all_amounts.append(amount)
 
     # Not enough transactions to constitute structuring
     if len(all_amounts) < min_count:
-        return RuleResult(score_delta=0, reasons=[], matched_rules=[])
+        return EMPTY_RESULT
 
     # For each amount, count how many others are within +/- variance.
     # If any single amount serves as a "center" with >= min_count neighbors
     # (including itself), we flag structuring.
-    max_cluster_size = 0
-    best_center = 0.0
-    best_cluster_amounts: list[float] = []
+    # In sorted order each center's cluster is a contiguous slice, so its
+    # size is the distance between two binary-search positions.
+    if not all(math.isfinite(a * 100) for a in all_amounts):
+        # round() cannot turn inf/nan into cents
+        cluster = _largest_cluster(all_amounts, amount_variance)
+        max_cluster_size = len(cluster)
+    else:
+        cents = [round(a * 100) for a in all_amounts]
+        sorted_cents = sorted(cents)
+        variance_ppm = round(amount_variance * _PPM)
+
+        max_cluster_size = 0
+        best_center = 0
+
+        # Centers are visited in arrival order so ties resolve as before
+        for center in cents:
+            lower, upper = _bounds(center, variance_ppm)
+            size = (
+                bisect_right(sorted_cents, upper)
+                - bisect_left(sorted_cents, lower)
+            )
 
-    for center in all_amounts:
-        lower_bound = center * (1 - amount_variance)
-        upper_bound = center * (1 + amount_variance)
-        cluster = [a for a in all_amounts if lower_bound <= a <= upper_bound]
+            if size > max_cluster_size:
+                max_cluster_size = size
+                best_center = center
 
-        if len(cluster) > max_cluster_size:
-            max_cluster_size = len(cluster)
-            best_center = center
-            best_cluster_amounts = cluster
+        # Materialize only the winning cluster, in arrival order
+        lower, upper = _bounds(best_center, variance_ppm)
+        cluster = [a for a, c in zip(all_amounts, cents) if lower <= c <= upper]
 
     if max_cluster_size >= min_count:
-        avg_amount = sum(best_cluster_amounts) / len(best_cluster_amounts)
+        avg_amount = sum(cluster) / len(cluster)
         return RuleResult(
             score_delta=50,
-            reasons=[
+            reasons=(
                 f"Potential structuring detected: {max_cluster_size} transactions "
                 f"of similar amounts (~${avg_amount:.2f}) within "
-                f"{window_minutes} minutes"
-            ],
-            matched_rules=["STRUCTURING_DETECTED"],
+                f"{window_minutes} minutes",
+            ),
+            matched_rules=("STRUCTURING_DETECTED",),
         )
 
-    return RuleResult(score_delta=0, reasons=[], matched_rules=[])
+    return EMPTY_RESULT
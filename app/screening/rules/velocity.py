@@ -7,8 +7,9 @@ per week, so a burst of activity in a short window warrants review.
 """
 
 from datetime import datetime, timedelta
+from typing import Optional
 
-from app.models import RuleResult
+from app.models import EMPTY_RESULT, RuleResult
 from app.storage.memory import MemoryStore
 
 
@@ -18,29 +19,32 @@ def check_velocity(
     timestamp: datetime,
     threshold: int = 5,
     window_minutes: int = 60,
+    sender_key: Optional[str] = None,
 ) -> RuleResult:
     """Check if the sender exceeds the transaction velocity threshold.
 
     Looks back `window_minutes` from the given timestamp and counts
     how many transactions the sender already has. If the count exceeds
-    `threshold`, the rule fires with score_delta=30.
+    `threshold`, the rule fires with score_delta=30. `sender_key` is the
+    store's normalized form of `sender_name`, if already computed.
     """
     # Calculate the start of the lookback window
     window_start = timestamp - timedelta(minutes=window_minutes)
 
-    # Retrieve the sender's recent transactions within the window
-    recent_txns = store.get_by_sender(sender_name, since=window_start)
-    # Include the current transaction in the count (not yet stored)
-    count = len(recent_txns) + 1
+    # Count the sender's recent transactions within the window, plus the
+    # current transaction (not yet stored)
+    count = store.count_by_sender(
+        sender_name, since=window_start, key=sender_key
+    ) + 1
 
     if count > threshold:
         return RuleResult(
             score_delta=50,
-            reasons=[
+            reasons=(
                 f"Sender has {count} transactions in the last "
-                f"{window_minutes} minutes (threshold: {threshold})"
-            ],
-            matched_rules=["VELOCITY_EXCEEDED"],
+                f"{window_minutes} minutes (threshold: {threshold})",
+            ),
+            matched_rules=("VELOCITY_EXCEEDED",),
         )
 
-    return RuleResult(score_delta=0, reasons=[], matched_rules=[])
+    return EMPTY_RESULT
@@ -10,6 +10,10 @@ Priority:
 
 from app.models import RuleResult
 
+# Rules that decide DENIED on their own, whatever the score. The engine
+# also skips the remaining rules once one of these fires.
+TERMINAL_RULES = frozenset({"SANCTIONS_MATCH"})
+
 
 def aggregate_results(
     rule_results: list[RuleResult],
@@ -25,17 +29,24 @@ def aggregate_results(
     total_score = 0
     all_reasons: list[str] = []
     all_matched_rules: list[str] = []
+    denied = False
 
+    # One pass over the results; the terminal-rule check looks only at
+    # each result's own (short) rule tuple, not the combined list
     for result in rule_results:
         total_score += result.score_delta
-        all_reasons.extend(result.reasons)
-        all_matched_rules.extend(result.matched_rules)
+        if result.reasons:
+            all_reasons.extend(result.reasons)
+        if result.matched_rules:
+            all_matched_rules.extend(result.matched_rules)
+            if not TERMINAL_RULES.isdisjoint(result.matched_rules):
+                denied = True
 
     # Cap the cumulative score at 100
     total_score = min(total_score, 100)
 
-    # Decision priority: sanctions override everything
-    if "SANCTIONS_MATCH" in all_matched_rules:
+    # Decision priority: sanctions (terminal rules) override everything
+    if denied:
         decision = "DENIED"
     elif total_score >= 50:
         decision = "REVIEW"
@@ -3,50 +3,340 @@
 Uses a dict keyed by normalized sender name for O(1) lookups
 during velocity and structuring checks. All data lives in memory
 and is lost on restart — suitable for a screening demo/prototype.
+
+Per-sender transaction histories and the audit log are kept sorted by
+timestamp, with a parallel sequence of timestamps, so time-range queries
+bisect to the window instead of scanning everything. Sender histories
+can be bounded by a retention period, evicting their oldest entries.
+Evicted entries are skipped via a start offset and cut from the front of
+the lists in batches, so eviction is amortized O(1) and a window read is
+a real list slice: O(log n + k) for k rows in the window. Eviction is
+measured back from the incoming transaction's timestamp,
+capped at the server clock, so one future-dated transaction cannot push
+a sender's whole history out.
+
+The audit log can be capped at a number of entries, dropping the earliest
+recorded ones (in arrival order, whatever their timestamps) once it is
+full. Each entry carries its arrival number, so dropped entries are
+skipped by queries and purged from the log in batches, keeping eviction
+amortized O(1) per insert.
+
+Timestamps are converted once, on insert, to integer microseconds since
+the Unix epoch (exact for datetime), so the bisects and eviction checks
+compare plain ints rather than timezone-aware datetimes.
 """
 
-from datetime import datetime
-from typing import Dict, List, Optional
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List, Optional, TypeVar
+
+from app.models import RulesConfig, StoredTransaction, AuditEntry
+
+T = TypeVar("T")
+
+
+def normalize_key(name: str) -> str:
+    """Normalize a sender name to a consistent dict key (casefolded, stripped)."""
+    return name.strip().casefold()
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+# /api/transactions looks back 24 hours by default, so history is never
+# kept for less than that
+_MIN_RETENTION = timedelta(hours=24)
+
+
+def history_retention(config: RulesConfig) -> timedelta:
+    """How long to keep sender history for the given rule windows.
+
+    Twice the longest velocity/structuring window, but at least 24 hours.
+    """
+    longest_window = max(
+        config.velocity_window_minutes,
+        config.structuring_window_minutes,
+    )
+    return max(timedelta(minutes=2 * longest_window), _MIN_RETENTION)
+
+
+def _as_utc(ts: datetime) -> datetime:
+    """Treat naive timestamps as UTC so they sort alongside aware ones."""
+    return ts if ts.tzinfo is not None else ts.replace(tzinfo=timezone.utc)
+
+
+def _epoch_us(ts: datetime) -> int:
+    """Microseconds since the Unix epoch (naive timestamps taken as UTC)."""
+    return (_as_utc(ts) - _EPOCH) // _MICROSECOND
+
+
+def _insert_sorted(
+    items: List[T],
+    stamps: List[int],
+    item: T,
+    ts: int,
+    start: int = 0,
+) -> int:
+    """Insert item after any entries with an equal or earlier timestamp.
+
+    Only positions from `start` on are considered. Returns the position it
+    was inserted at, for other parallel lists.
+    """
+    # Transactions mostly arrive in time order, so append without a search
+    if len(stamps) == start or ts >= stamps[-1]:
+        stamps.append(ts)
+        items.append(item)
+        return len(stamps) - 1
+    i = bisect_right(stamps, ts, start)
+    stamps.insert(i, ts)
+    items.insert(i, item)
+    return i
+
+
+def _bounds(
+    stamps: List[int],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    start: int = 0,
+) -> tuple[int, int]:
+    """Positions from `start` on spanning the timestamps within [since, until]."""
+    lo = start if since is None else bisect_left(stamps, _epoch_us(since), start)
+    hi = len(stamps) if until is None else bisect_right(stamps, _epoch_us(until), start)
+    return lo, hi
+
+
+def _window(
+    items: List[T],
+    stamps: List[int],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    start: int = 0,
+) -> List[T]:
+    """Return the items from `start` on whose timestamps fall within [since, until]."""
+    lo, hi = _bounds(stamps, since, until, start)
+    return items[lo:hi]
+
 
-from app.models import StoredTransaction, AuditEntry
+@dataclass(slots=True)
+class _SenderHistory:
+    """One sender's transactions, sorted by timestamp, as parallel lists.
 
+    Entries before `start` have been evicted and are no longer read.
+    """
 
-def _normalize_key(name: str) -> str:
-    """Normalize a sender name to a consistent dict key (lowercase, stripped)."""
-    return name.strip().lower()
+    transactions: List[StoredTransaction] = field(default_factory=list)
+    stamps: List[int] = field(default_factory=list)
+    # Amounts too, so structuring can read them without touching the
+    # transaction objects
+    amounts: List[float] = field(default_factory=list)
+    start: int = 0
+
+    def add(self, tx: StoredTransaction, ts: int) -> None:
+        """Insert a transaction with its epoch-microsecond timestamp."""
+        i = _insert_sorted(self.transactions, self.stamps, tx, ts, self.start)
+        self.amounts.insert(i, tx.amount)
+
+    def evict_before(self, cutoff: int) -> None:
+        """Evict entries with timestamps before `cutoff`."""
+        self.start = bisect_left(self.stamps, cutoff, self.start)
+        # Cut the evicted prefix once it is at least as long as what is kept
+        if self.start and self.start * 2 >= len(self.stamps):
+            del self.transactions[:self.start]
+            del self.stamps[:self.start]
+            del self.amounts[:self.start]
+            self.start = 0
 
 
 class MemoryStore:
     """Thread-safe in-memory store for transactions and audit entries."""
 
-    def __init__(self) -> None:
-        # Transactions indexed by normalized sender name for fast lookups
-        self._transactions: Dict[str, List[StoredTransaction]] = {}
-        # Chronological audit log
+    def __init__(
+        self,
+        retention: Optional[timedelta] = None,
+        audit_limit: Optional[int] = None,
+    ) -> None:
+        """Create an empty store.
+
+        If `retention` is set, a sender's transactions older than that
+        relative to each new one (or to now, if it is future-dated) are
+        evicted as new ones arrive. If `audit_limit` is set, only that many
+        of the most recently added audit entries are kept.
+        """
+        self.retention: Optional[timedelta] = None
+        self._retention_us: Optional[int] = None
+        # Transaction histories indexed by normalized sender name for fast
+        # lookups
+        self._senders: Dict[str, _SenderHistory] = {}
+        # Chronological audit log, its timestamps, each entry's arrival
+        # number, and an index by transaction
         self._audit_log: List[AuditEntry] = []
+        self._audit_ts: List[int] = []
+        self._audit_seq: List[int] = []
+        self._audit_by_tx: Dict[str, List[AuditEntry]] = {}
+        self._audit_added = 0
+        # With a limit, the kept entries in arrival order. Entries whose
+        # arrival number is below _audit_floor have been evicted; they stay
+        # in the lists above until the next purge.
+        self.audit_limit = audit_limit
+        self._audit_arrivals: Optional[Deque[AuditEntry]] = (
+            None if audit_limit is None else deque()
+        )
+        self._audit_floor = 0
+        # Screening runs on worker threads, so every read and write of the
+        # containers above happens under this lock
+        self._lock = threading.RLock()
+        self.set_retention(retention)
+
+    def set_retention(self, retention: Optional[timedelta]) -> None:
+        """Change the retention period; it applies from the next insert on.
+
+        Widening it keeps later history longer, but cannot bring back
+        transactions already evicted.
+        """
+        with self._lock:
+            self.retention = retention
+            self._retention_us = (
+                None if retention is None else retention // _MICROSECOND
+            )
+
+    def clear(self) -> None:
+        """Remove all transactions and audit entries, keeping the store object."""
+        with self._lock:
+            self._senders.clear()
+            self._audit_log.clear()
+            self._audit_ts.clear()
+            self._audit_seq.clear()
+            self._audit_by_tx.clear()
+            self._audit_added = 0
+            if self._audit_arrivals is not None:
+                self._audit_arrivals.clear()
+            self._audit_floor = 0
 
-    def add(self, tx: StoredTransaction) -> None:
-        """Store a transaction, indexed by normalized sender name."""
-        key = _normalize_key(tx.sender_name)
-        if key not in self._transactions:
-            self._transactions[key] = []
-        self._transactions[key].append(tx)
+    def add(self, tx: StoredTransaction, key: Optional[str] = None) -> None:
+        """Store a transaction, indexed by normalized sender name.
+
+        Callers that already normalized the sender name can pass it as
+        `key` to skip normalizing again.
+        """
+        if key is None:
+            key = normalize_key(tx.sender_name)
+        with self._lock:
+            history = self._senders.get(key)
+            if history is None:
+                history = self._senders[key] = _SenderHistory()
+            ts = _epoch_us(tx.timestamp)
+            history.add(tx, ts)
+
+            # Drop history that has aged out of the retention period. The
+            # client-supplied timestamp is capped at the server clock, so a
+            # future-dated transaction does not evict everything before it.
+            if self._retention_us is not None:
+                now_us = time.time_ns() // 1000
+                history.evict_before(min(ts, now_us) - self._retention_us)
 
     def add_audit(self, entry: AuditEntry) -> None:
-        """Append an entry to the audit log."""
-        self._audit_log.append(entry)
+        """Add an entry to the audit log."""
+        with self._lock:
+            i = _insert_sorted(
+                self._audit_log,
+                self._audit_ts,
+                entry,
+                _epoch_us(entry.timestamp),
+            )
+            self._audit_seq.insert(i, self._audit_added)
+            self._audit_added += 1
+            self._audit_by_tx.setdefault(entry.transaction_id, []).append(entry)
+            if self._audit_arrivals is not None:
+                self._audit_arrivals.append(entry)
+                self._evict_audit(self.audit_limit)
+
+    def _evict_audit(self, limit: int) -> None:
+        """Drop the earliest-added audit entries beyond `limit` (caller holds the lock)."""
+        arrivals = self._audit_arrivals
+        while len(arrivals) > limit:
+            # Entries for a transaction are indexed in arrival order too
+            entry = arrivals.popleft()
+            entries = self._audit_by_tx[entry.transaction_id]
+            del entries[0]
+            if not entries:
+                del self._audit_by_tx[entry.transaction_id]
+            self._audit_floor += 1
+
+        # Purge evicted entries once there are at least as many as kept ones
+        evicted = len(self._audit_log) - len(arrivals)
+        if evicted and evicted >= len(arrivals):
+            floor = self._audit_floor
+            kept = [
+                i for i, seq in enumerate(self._audit_seq) if seq >= floor
+            ]
+            self._audit_log = [self._audit_log[i] for i in kept]
+            self._audit_ts = [self._audit_ts[i] for i in kept]
+            self._audit_seq = [self._audit_seq[i] for i in kept]
 
     def get_by_sender(
         self,
         sender_name: str,
         since: Optional[datetime] = None,
+        key: Optional[str] = None,
     ) -> List[StoredTransaction]:
-        """Return transactions for a sender, optionally filtered by timestamp >= since."""
-        key = _normalize_key(sender_name)
-        txns = self._transactions.get(key, [])
-        if since is not None:
-            txns = [t for t in txns if t.timestamp >= since]
-        return txns
+        """Return transactions for a sender, optionally filtered by timestamp >= since.
+
+        `key` is the pre-normalized sender name, if the caller has it.
+        """
+        if key is None:
+            key = normalize_key(sender_name)
+        with self._lock:
+            history = self._senders.get(key)
+            if history is None:
+                return []
+            return _window(
+                history.transactions, history.stamps, since, None, history.start
+            )
+
+    def count_by_sender(
+        self,
+        sender_name: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        key: Optional[str] = None,
+    ) -> int:
+        """Count a sender's transactions within [since, until], without copying them.
+
+        `key` is the pre-normalized sender name, if the caller has it.
+        """
+        if key is None:
+            key = normalize_key(sender_name)
+        with self._lock:
+            history = self._senders.get(key)
+            if history is None:
+                return 0
+            lo, hi = _bounds(history.stamps, since, until, history.start)
+            return max(hi - lo, 0)
+
+    def get_amounts_by_sender(
+        self,
+        sender_name: str,
+        since: Optional[datetime] = None,
+        key: Optional[str] = None,
+    ) -> List[float]:
+        """Return a sender's transaction amounts, oldest first, like get_by_sender.
+
+        `key` is the pre-normalized sender name, if the caller has it.
+        """
+        if key is None:
+            key = normalize_key(sender_name)
+        with self._lock:
+            history = self._senders.get(key)
+            if history is None:
+                return []
+            return _window(
+                history.amounts, history.stamps, since, None, history.start
+            )
 
     def get_all(
         self,
@@ -55,13 +345,14 @@ class MemoryStore:
     ) -> List[StoredTransaction]:
         """Return all transactions, optionally filtered by time range."""
         results: List[StoredTransaction] = []
-        for txn_list in self._transactions.values():
-            for t in txn_list:
-                if since is not None and t.timestamp < since:
-                    continue
-                if until is not None and t.timestamp > until:
-                    continue
-                results.append(t)
+        with self._lock:
+            for history in self._senders.values():
+                results.extend(
+                    _window(
+                        history.transactions, history.stamps, since, until,
+                        history.start,
+                    )
+                )
         return results
 
     def get_audit_log(
@@ -71,13 +362,25 @@ class MemoryStore:
         until: Optional[datetime] = None,
     ) -> List[AuditEntry]:
         """Return audit entries, optionally filtered by transaction ID and/or time range."""
-        results: List[AuditEntry] = []
-        for entry in self._audit_log:
-            if transaction_id is not None and entry.transaction_id != transaction_id:
-                continue
-            if since is not None and entry.timestamp < since:
-                continue
-            if until is not None and entry.timestamp > until:
-                continue
-            results.append(entry)
-        return results
+        with self._lock:
+            if transaction_id is None:
+                lo, hi = _bounds(self._audit_ts, since, until)
+                floor = self._audit_floor
+                if not floor:
+                    return self._audit_log[lo:hi]
+                # Skip entries evicted but not yet purged
+                return [
+                    e for e, seq in zip(
+                        self._audit_log[lo:hi], self._audit_seq[lo:hi]
+                    )
+                    if seq >= floor
+                ]
+
+            entries = self._audit_by_tx.get(transaction_id, [])
+            lo = None if since is None else _epoch_us(since)
+            hi = None if until is None else _epoch_us(until)
+            return [
+                e for e in entries
+                if (lo is None or _epoch_us(e.timestamp) >= lo)
+                and (hi is None or _epoch_us(e.timestamp) <= hi)
+            ]
@@ -2,11 +2,12 @@
 
 import pytest
 from datetime import datetime, timezone
+from functools import lru_cache
 from fastapi.testclient import TestClient
 
 from app.main import app
 from app.models import RulesConfig, TransactionRequest, StoredTransaction
-from app.storage.memory import MemoryStore
+from app.storage.memory import MemoryStore, history_retention
 from app.screening.engine import ScreeningEngine
 
 
@@ -55,10 +56,29 @@ def engine(sanctions_list, high_risk_countries, store, config):
     )
 
 
-@pytest.fixture
-def client():
+@pytest.fixture(scope="session")
+def _app_client():
+    # Start the app (and its worker pool) once for the whole session
     with TestClient(app) as c:
-        yield c
+        yield c, app.state.config
+
+
+@pytest.fixture
+def client(_app_client):
+    # Give every test an empty store and the startup rules configuration
+    c, startup_config = _app_client
+    app.state.store.clear()
+    app.state.config = startup_config
+    app.state.engine.config = startup_config
+    app.state.store.set_retention(history_retention(startup_config))
+    return c
+
+
+@lru_cache(maxsize=256)
+def parse_ts(timestamp: str) -> datetime:
+    # Tests reuse a handful of literal timestamps; datetimes are immutable,
+    # so each string is parsed once and the result shared
+    return datetime.fromisoformat(timestamp)
 
 
 def make_request(
@@ -75,7 +95,7 @@ def make_request(
         amount=amount,
         currency=currency,
         destination_country=country,
-        timestamp=datetime.fromisoformat(timestamp.replace("Z", "+00:00")),
+        timestamp=parse_ts(timestamp),
     )
 
 
@@ -92,7 +112,7 @@ def make_stored(
         amount=amount,
         currency="USD",
         destination_country="US",
-        timestamp=datetime.fromisoformat(timestamp.replace("Z", "+00:00")),
+        timestamp=parse_ts(timestamp),
         decision="APPROVED",
         risk_score=0,
     )
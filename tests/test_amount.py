@@ -14,7 +14,7 @@ class TestCheckAmount:
         """$2000 is NOT > $2000, should not trigger."""
         result = check_amount(2000.0)
         assert result.score_delta == 0
-        assert result.matched_rules == []
+        assert result.matched_rules == ()
 
     def test_just_above_threshold(self):
         result = check_amount(2000.01)
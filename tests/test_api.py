@@ -1,7 +1,13 @@
 """Integration tests for the FastAPI endpoints."""
 
+import os
+from concurrent.futures.process import BrokenProcessPool
+
 import pytest
 
+from app.routes import screening
+from app.screening.parallel import create_pool
+
 
 class TestHealthEndpoint:
     def test_health(self, client):
@@ -76,6 +82,23 @@ class TestScreeningEndpoint:
         assert data["decision"] == "REVIEW"
         assert "STRUCTURING_DETECTED" in data["matched_rules"]
 
+    def test_future_dated_transaction_keeps_history(self, client):
+        # A far-future transaction must not evict the sender's real history
+        self._post(client, sender_name="Smurf", amount=500.0, timestamp="2030-01-01T00:00:00Z")
+        self._post(client, sender_name="Smurf", amount=500.0, timestamp="2026-02-22T16:00:00Z")
+        resp = self._post(client, sender_name="Smurf", amount=500.0, timestamp="2026-02-22T16:05:00Z")
+        assert "STRUCTURING_DETECTED" in resp.json()["matched_rules"]
+
+    def test_non_finite_amount_after_history(self, client):
+        self._post(client, sender_name="Overflow", amount=500.0, timestamp="2026-02-22T16:00:00Z")
+        self._post(client, sender_name="Overflow", amount=490.0, timestamp="2026-02-22T16:05:00Z")
+        resp = self._post(client, sender_name="Overflow", amount="inf", timestamp="2026-02-22T16:10:00Z")
+        assert resp.status_code == 200
+        assert resp.json()["matched_rules"] == ["LARGE_AMOUNT"]
+        resp = self._post(client, sender_name="Overflow", amount="nan", timestamp="2026-02-22T16:15:00Z")
+        assert resp.status_code == 200
+        assert resp.json()["decision"] == "APPROVED"
+
     def test_response_has_reasons(self, client):
         resp = self._post(client, destination_country="KP")
         data = resp.json()
@@ -90,6 +113,16 @@ class TestScreeningEndpoint:
         resp = client.post("/api/screening", json={})
         assert resp.status_code == 422
 
+    def test_sanctions_cache_stats(self, client):
+        self._post(client, sender_name="Repeat Sender")
+        self._post(client, sender_name="Repeat Sender")
+        resp = client.get("/api/screening/cache")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["hits"] >= 1
+        assert data["currsize"] >= 1
+        assert data["maxsize"] > 0
+
 
 class TestBatchEndpoint:
     def test_batch_mixed(self, client):
@@ -139,6 +172,85 @@ class TestBatchEndpoint:
         data = resp.json()
         assert data["summary"]["total"] == 0
 
+    def test_batch_preserves_order_and_sender_history(self, client):
+        """Same-sender transactions in a batch see each other, in order."""
+        payload = {
+            "transactions": [
+                {"sender_name": "BatchSplit", "recipient_name": "X", "amount": 500, "currency": "USD", "destination_country": "US", "timestamp": "2026-02-24T16:00:00Z"},
+                {"sender_name": "BatchOther", "recipient_name": "Y", "amount": 100, "currency": "USD", "destination_country": "IR", "timestamp": "2026-02-24T16:01:00Z"},
+                {"sender_name": "BatchSplit", "recipient_name": "X", "amount": 490, "currency": "USD", "destination_country": "US", "timestamp": "2026-02-24T16:05:00Z"},
+                {"sender_name": "BatchSplit", "recipient_name": "X", "amount": 510, "currency": "USD", "destination_country": "US", "timestamp": "2026-02-24T16:10:00Z"},
+            ]
+        }
+        resp = client.post("/api/screening/batch", json=payload)
+        results = resp.json()["results"]
+        assert [r["decision"] for r in results] == ["APPROVED", "REVIEW", "APPROVED", "REVIEW"]
+        assert "HIGH_RISK_COUNTRY" in results[1]["matched_rules"]
+        assert "STRUCTURING_DETECTED" in results[3]["matched_rules"]
+
+    def test_batch_uses_one_config_snapshot(self, client, monkeypatch):
+        """A rules update between the batch phases does not mix configs."""
+        engine = client.app.state.engine
+        run_batch = engine.run_stateless_rules_batch
+
+        def run_then_update(transactions, config):
+            results = run_batch(transactions, config)
+            engine.config = config.model_copy(update={"velocity_threshold": 1})
+            return results
+
+        monkeypatch.setattr(engine, "run_stateless_rules_batch", run_then_update)
+        payload = {
+            "transactions": [
+                {"sender_name": "Snapshot", "recipient_name": "X", "amount": 100, "currency": "USD", "destination_country": "US", "timestamp": "2026-02-25T10:00:00Z"},
+                {"sender_name": "Snapshot", "recipient_name": "X", "amount": 900, "currency": "USD", "destination_country": "US", "timestamp": "2026-02-25T10:05:00Z"},
+            ]
+        }
+        results = client.post("/api/screening/batch", json=payload).json()["results"]
+        assert [r["decision"] for r in results] == ["APPROVED", "APPROVED"]
+
+    def test_batch_process_pool_path(self, client, monkeypatch):
+        """Batches over the pool threshold give the same decisions."""
+        monkeypatch.setattr(screening, "PROCESS_POOL_MIN_BATCH", 1)
+        payload = {
+            "transactions": [
+                {"sender_name": "Pool Clean", "recipient_name": "Other", "amount": 100, "currency": "USD", "destination_country": "US", "timestamp": "2026-02-22T10:00:00Z"},
+                {"sender_name": "Muhammed Ahmad", "recipient_name": "Test", "amount": 200, "currency": "USD", "destination_country": "US", "timestamp": "2026-02-22T10:00:00Z"},
+                {"sender_name": "Pool Large", "recipient_name": "Friend", "amount": 3000, "currency": "USD", "destination_country": "US", "timestamp": "2026-02-22T10:00:00Z"},
+            ]
+        }
+        resp = client.post("/api/screening/batch", json=payload)
+        results = resp.json()["results"]
+        assert [r["decision"] for r in results] == ["APPROVED", "DENIED", "REVIEW"]
+        assert "LARGE_AMOUNT" in results[2]["matched_rules"]
+
+    def test_batch_recovers_from_broken_pool(self, client, monkeypatch):
+        """A pool with a dead worker is replaced and the batch still runs."""
+        monkeypatch.setattr(screening, "PROCESS_POOL_MIN_BATCH", 1)
+        engine = client.app.state.engine
+        broken = create_pool(engine.sanctions_list, engine.high_risk_countries, max_workers=1)
+        with pytest.raises(BrokenProcessPool):
+            broken.submit(os._exit, 1).result()
+        monkeypatch.setattr(client.app.state, "pool", broken)
+
+        payload = {
+            "transactions": [
+                {"sender_name": "Broken Pool", "recipient_name": "Other", "amount": 3000, "currency": "USD", "destination_country": "US", "timestamp": "2026-02-22T10:00:00Z"},
+                {"sender_name": "Muhammed Ahmad", "recipient_name": "Test", "amount": 200, "currency": "USD", "destination_country": "US", "timestamp": "2026-02-22T10:00:00Z"},
+            ]
+        }
+        resp = client.post("/api/screening/batch", json=payload)
+        assert resp.status_code == 200
+        assert [r["decision"] for r in resp.json()["results"]] == ["REVIEW", "DENIED"]
+
+        # Later batches use the replacement pool
+        replacement = client.app.state.pool
+        assert replacement is not broken
+        try:
+            resp = client.post("/api/screening/batch", json=payload)
+            assert resp.status_code == 200
+        finally:
+            replacement.shutdown()
+
 
 class TestTransactionsEndpoint:
     def test_get_transactions_after_screening(self, client):
@@ -222,6 +334,29 @@ class TestRulesEndpoint:
             "fuzzy_match_threshold": 85,
         })
 
+    def test_widened_window_keeps_history(self, client):
+        # A 50h velocity window needs more than the default 24h of history
+        client.put("/api/rules", json={
+            "velocity_threshold": 4, "velocity_window_minutes": 3000,
+            "amount_threshold": 2000, "structuring_window_minutes": 30,
+            "structuring_min_count": 3, "structuring_amount_variance": 0.20,
+            "fuzzy_match_threshold": 85,
+        })
+        timestamps = (
+            "2026-02-22T10:00:00Z", "2026-02-22T20:00:00Z",
+            "2026-02-23T06:00:00Z", "2026-02-23T11:00:00Z",
+        )
+        for ts in timestamps:
+            client.post("/api/screening", json={
+                "sender_name": "WideWindow", "recipient_name": "B", "amount": 100,
+                "currency": "USD", "destination_country": "US", "timestamp": ts,
+            })
+        resp = client.post("/api/screening", json={
+            "sender_name": "WideWindow", "recipient_name": "B", "amount": 900,
+            "currency": "USD", "destination_country": "US", "timestamp": "2026-02-23T12:00:00Z",
+        })
+        assert "VELOCITY_EXCEEDED" in resp.json()["matched_rules"]
+
 
 class TestAuditEndpoint:
     def test_audit_populated_after_screening(self, client):
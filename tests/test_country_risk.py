@@ -21,8 +21,8 @@ class TestCheckCountry:
     def test_safe_country_us(self, high_risk_countries):
         result = check_country("US", high_risk_countries)
         assert result.score_delta == 0
-        assert result.matched_rules == []
-        assert result.reasons == []
+        assert result.matched_rules == ()
+        assert result.reasons == ()
 
     def test_safe_country_mexico(self, high_risk_countries):
         result = check_country("MX", high_risk_countries)
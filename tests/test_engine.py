@@ -1,5 +1,6 @@
 """Tests for the screening engine orchestrator."""
 
+from app.screening.engine import run_stateless_rules
 from tests.conftest import make_request
 
 
@@ -12,6 +13,8 @@ class TestScreeningEngine:
         assert resp.reasons == []
         assert resp.matched_rules == []
         assert resp.transaction_id  # UUID generated
+        assert len(resp.transaction_id) == 32
+        int(resp.transaction_id, 16)  # plain hex, no dashes
 
     def test_sanctions_denied(self, engine):
         req = make_request(sender="Mohammad Ahmad")
@@ -111,6 +114,21 @@ class TestScreeningEngine:
         assert resp1.risk_score == resp2.risk_score
         assert resp1.reasons == resp2.reasons
 
+    def test_stateless_batch_matches_per_request(self, engine):
+        requests = [
+            make_request(sender="Mohammad Ahmad"),
+            make_request(recipient="Ali Hassan", country="IR"),
+            make_request(amount=5000.0),
+            make_request(),
+        ]
+        expected = [
+            run_stateless_rules(
+                req, engine.sanctions_index, engine.high_risk_countries, engine.config
+            )
+            for req in requests
+        ]
+        assert engine.run_stateless_rules_batch(requests) == expected
+
     def test_unique_transaction_ids(self, engine):
         resp1 = engine.screen(make_request(timestamp="2026-02-22T10:00:00Z"))
         resp2 = engine.screen(make_request(timestamp="2026-02-22T10:01:00Z"))
@@ -122,3 +140,12 @@ class TestScreeningEngine:
         resp = engine.screen(req)
         assert resp.decision == "DENIED"
         assert "SANCTIONS_MATCH" in resp.matched_rules
+
+    def test_sanctions_skips_other_rules_but_is_stored(self, engine):
+        req = make_request(sender="Mohammad Ahmad", country="IR", amount=5000.0)
+        resp = engine.screen(req)
+        assert resp.risk_score == 100
+        assert resp.matched_rules == ["SANCTIONS_MATCH"]
+        assert len(engine.store.get_by_sender("Mohammad Ahmad")) == 1
+        audit = engine.store.get_audit_log(transaction_id=resp.transaction_id)
+        assert audit[0].decision == "DENIED"
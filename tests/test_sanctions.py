@@ -1,6 +1,6 @@
 """Tests for the sanctions matching rule."""
 
-from app.screening.rules.sanctions import check_sanctions, _normalize_name
+from app.screening.rules.sanctions import SanctionsIndex, check_sanctions, _normalize_name
 
 
 class TestNormalizeName:
@@ -41,6 +41,13 @@ class TestCheckSanctions:
         assert result.score_delta == 100
         assert "SANCTIONS_MATCH" in result.matched_rules
 
+    def test_first_letter_variant_match(self, sanctions_list):
+        """A typo in the first letter must not hide a sanctioned name."""
+        result = check_sanctions("Wiktor Petrov", "Clean Person", sanctions_list)
+        assert "SANCTIONS_MATCH" in result.matched_rules
+        result = check_sanctions("Clean Person", "Pohammad Ahmad", sanctions_list)
+        assert "SANCTIONS_MATCH" in result.matched_rules
+
     def test_both_sender_and_recipient_match(self, sanctions_list):
         result = check_sanctions("Mohammad Ahmad", "Ali Hassan", sanctions_list)
         assert result.score_delta == 100
@@ -53,8 +60,8 @@ class TestCheckSanctions:
     def test_no_match_clean_names(self, sanctions_list):
         result = check_sanctions("Maria Garcia", "Rosa Delgado", sanctions_list)
         assert result.score_delta == 0
-        assert result.matched_rules == []
-        assert result.reasons == []
+        assert result.matched_rules == ()
+        assert result.reasons == ()
 
     def test_organization_match(self, sanctions_list):
         result = check_sanctions("Al-Rashid Trading Company", "Someone", sanctions_list)
@@ -82,7 +89,7 @@ class TestCheckSanctions:
     def test_empty_sanctions_list(self):
         result = check_sanctions("Mohammad Ahmad", "Ali Hassan", [])
         assert result.score_delta == 0
-        assert result.matched_rules == []
+        assert result.matched_rules == ()
 
     def test_sanctions_match_appears_once(self, sanctions_list):
         """SANCTIONS_MATCH should only appear once even if multiple names match."""
@@ -96,3 +103,45 @@ class TestCheckSanctions:
     def test_similarity_percentage_in_reasons(self, sanctions_list):
         result = check_sanctions("Mohammad Ahmad", "Clean", sanctions_list)
         assert any("similarity:" in r for r in result.reasons)
+
+    def test_prebuilt_index_matches(self, sanctions_list):
+        index = SanctionsIndex(sanctions_list)
+        result = check_sanctions("Muhammed Ahmad", "Clean", sanctions_list, index=index)
+        assert result.score_delta == 100
+        assert "SANCTIONS_MATCH" in result.matched_rules
+
+    def test_reason_reports_original_sanctioned_name(self, sanctions_list):
+        result = check_sanctions("al rashid trading company", "Clean", sanctions_list)
+        assert any("'Al-Rashid Trading Company'" in r for r in result.reasons)
+
+    def test_index_match_returns_positions_and_scores(self, sanctions_list):
+        index = SanctionsIndex(sanctions_list)
+        matches = index.match("Viktor Petrov", threshold=85)
+        positions = [position for position, _ in matches]
+        assert sanctions_list.index("Viktor Petrov") in positions
+        assert all(score >= 85 for _, score in matches)
+
+    def test_index_match_no_candidates(self, sanctions_list):
+        index = SanctionsIndex(sanctions_list)
+        assert index.match("Xyzzy Qwfp", threshold=85) == ()
+
+    def test_index_caches_by_normalized_name(self, sanctions_list):
+        index = SanctionsIndex(sanctions_list)
+        first = index.match("Viktor Petrov", threshold=85)
+        assert index.match("  viktor   PETROV ", threshold=85) == first
+        info = index.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+        index.cache_clear()
+        assert index.cache_info().currsize == 0
+
+    def test_index_match_in_list_order_regardless_of_length(self):
+        index = SanctionsIndex(["Mohammad Ahmadi", "Mohammad Ahmad", "Mohamad Ahmad"])
+        matches = index.match("Mohammad Ahmad", threshold=85)
+        assert [position for position, _ in matches] == [0, 1, 2]
+
+    def test_match_many_matches_single_lookups(self, sanctions_list):
+        names = ["Viktor Petrov", "Clean Person", "ahmad  MOHAMMAD", "Viktor Petrov"]
+        batch = SanctionsIndex(sanctions_list).match_many(names, threshold=85)
+        single = SanctionsIndex(sanctions_list)
+        assert batch == [single.match(name, threshold=85) for name in names]
+        assert batch[1] == ()
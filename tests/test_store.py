@@ -1,9 +1,9 @@
 """Tests for the in-memory storage."""
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from app.models import AuditEntry, TransactionRequest
 from app.storage.memory import MemoryStore
-from tests.conftest import make_stored
+from tests.conftest import make_stored, parse_ts
 
 
 class TestMemoryStoreAdd:
@@ -40,6 +40,15 @@ class TestMemoryStoreNormalization:
         store.add(make_stored(sender="John Smith", tx_id="tx-1"))
         assert len(store.get_by_sender("  John Smith  ")) == 1
 
+    def test_caseless_unicode(self, store):
+        store.add(make_stored(sender="Johann Strauß", tx_id="tx-1"))
+        assert len(store.get_by_sender("JOHANN STRAUSS")) == 1
+
+    def test_prenormalized_key(self, store):
+        store.add(make_stored(sender="John Smith", tx_id="tx-1"), key="john smith")
+        assert len(store.get_by_sender("John Smith")) == 1
+        assert len(store.get_by_sender("ignored", key="john smith")) == 1
+
 
 class TestMemoryStoreTimestampFilter:
     def test_filter_by_since(self, store):
@@ -50,12 +59,109 @@ class TestMemoryStoreTimestampFilter:
         assert len(results) == 1
         assert results[0].transaction_id == "new"
 
+    def test_out_of_order_insert_sorted(self, store):
+        store.add(make_stored(sender="A", timestamp="2026-02-22T14:00:00Z", tx_id="late"))
+        store.add(make_stored(sender="A", timestamp="2026-02-22T10:00:00Z", tx_id="early"))
+        results = store.get_by_sender("A")
+        assert [t.transaction_id for t in results] == ["early", "late"]
+
+    def test_mixed_utc_offsets_sorted_by_instant(self, store):
+        store.add(make_stored(sender="A", timestamp="2026-02-22T10:30:00Z", tx_id="utc"))
+        store.add(make_stored(sender="A", timestamp="2026-02-22T12:05:00+02:00", tx_id="cest"))
+        results = store.get_by_sender("A")
+        assert [t.transaction_id for t in results] == ["cest", "utc"]
+        since = datetime(2026, 2, 22, 10, 5, 0, 1, tzinfo=timezone.utc)
+        assert [t.transaction_id for t in store.get_by_sender("A", since=since)] == ["utc"]
+
     def test_no_since_returns_all(self, store):
         store.add(make_stored(sender="A", timestamp="2026-02-22T10:00:00Z", tx_id="1"))
         store.add(make_stored(sender="A", timestamp="2026-02-22T14:00:00Z", tx_id="2"))
         assert len(store.get_by_sender("A")) == 2
 
 
+class TestMemoryStoreRetention:
+    def test_old_transactions_evicted(self):
+        store = MemoryStore(retention=timedelta(hours=2))
+        store.add(make_stored(sender="A", timestamp="2026-02-22T10:00:00Z", tx_id="old"))
+        store.add(make_stored(sender="A", timestamp="2026-02-22T11:30:00Z", tx_id="mid"))
+        store.add(make_stored(sender="A", timestamp="2026-02-22T13:00:00Z", tx_id="new"))
+        assert [t.transaction_id for t in store.get_by_sender("A")] == ["mid", "new"]
+
+    def test_other_senders_unaffected(self):
+        store = MemoryStore(retention=timedelta(hours=2))
+        store.add(make_stored(sender="A", timestamp="2026-02-22T10:00:00Z", tx_id="a"))
+        store.add(make_stored(sender="B", timestamp="2026-02-22T20:00:00Z", tx_id="b"))
+        assert len(store.get_by_sender("A")) == 1
+
+    def test_future_dated_transaction_does_not_evict_history(self):
+        store = MemoryStore(retention=timedelta(hours=2))
+        store.add(make_stored(sender="A", timestamp="2030-01-01T00:00:00Z", tx_id="future"))
+        store.add(make_stored(sender="A", timestamp="2026-02-22T10:00:00Z", tx_id="1"))
+        store.add(make_stored(sender="A", timestamp="2026-02-22T10:05:00Z", tx_id="2"))
+        assert [t.transaction_id for t in store.get_by_sender("A")] == ["1", "2", "future"]
+
+    def test_no_retention_keeps_everything(self, store):
+        store.add(make_stored(sender="A", timestamp="2026-02-20T10:00:00Z", tx_id="1"))
+        store.add(make_stored(sender="A", timestamp="2026-02-22T10:00:00Z", tx_id="2"))
+        assert len(store.get_by_sender("A")) == 2
+
+
+class TestMemoryStoreCount:
+    def test_count_all(self, store):
+        store.add(make_stored(sender="A", tx_id="1"))
+        store.add(make_stored(sender="A", tx_id="2"))
+        assert store.count_by_sender("a") == 2
+
+    def test_count_within_range(self, store):
+        for hour in (10, 12, 14, 16):
+            store.add(make_stored(sender="A", timestamp=f"2026-02-22T{hour}:00:00Z"))
+        since = datetime(2026, 2, 22, 12, 0, tzinfo=timezone.utc)
+        until = datetime(2026, 2, 22, 14, 0, tzinfo=timezone.utc)
+        assert store.count_by_sender("A", since=since) == 3
+        assert store.count_by_sender("A", since=since, until=until) == 2
+
+    def test_inverted_range_is_zero(self, store):
+        store.add(make_stored(sender="A", timestamp="2026-02-22T12:00:00Z"))
+        since = datetime(2026, 2, 22, 13, 0, tzinfo=timezone.utc)
+        until = datetime(2026, 2, 22, 11, 0, tzinfo=timezone.utc)
+        assert store.count_by_sender("A", since=since, until=until) == 0
+
+    def test_nonexistent_sender_zero(self, store):
+        assert store.count_by_sender("Nobody") == 0
+
+
+class TestMemoryStoreAmounts:
+    def test_amounts_follow_timestamp_order(self, store):
+        store.add(make_stored(sender="A", amount=300.0, timestamp="2026-02-22T14:00:00Z"))
+        store.add(make_stored(sender="A", amount=100.0, timestamp="2026-02-22T10:00:00Z"))
+        store.add(make_stored(sender="A", amount=200.0, timestamp="2026-02-22T12:00:00Z"))
+        assert store.get_amounts_by_sender("A") == [100.0, 200.0, 300.0]
+
+    def test_amounts_filter_by_since(self, store):
+        store.add(make_stored(sender="A", amount=100.0, timestamp="2026-02-22T10:00:00Z"))
+        store.add(make_stored(sender="A", amount=200.0, timestamp="2026-02-22T14:00:00Z"))
+        since = datetime(2026, 2, 22, 12, 0, tzinfo=timezone.utc)
+        assert store.get_amounts_by_sender("a", since=since) == [200.0]
+
+    def test_amounts_evicted_with_transactions(self):
+        store = MemoryStore(retention=timedelta(hours=2))
+        store.add(make_stored(sender="A", amount=100.0, timestamp="2026-02-22T10:00:00Z"))
+        store.add(make_stored(sender="A", amount=200.0, timestamp="2026-02-22T13:00:00Z"))
+        assert store.get_amounts_by_sender("A") == [200.0]
+
+    def test_nonexistent_sender_empty(self, store):
+        assert store.get_amounts_by_sender("Nobody") == []
+
+
+class TestMemoryStoreClear:
+    def test_clear_empties_transactions_and_audit(self, store):
+        store.add(make_stored(sender="A", tx_id="tx-1"))
+        store.clear()
+        assert store.get_by_sender("A") == []
+        assert store.get_all() == []
+        assert store.get_audit_log() == []
+
+
 class TestMemoryStoreGetAll:
     def test_get_all_no_filter(self, store):
         store.add(make_stored(sender="A", tx_id="1"))
@@ -84,11 +190,11 @@ class TestMemoryStoreAudit:
     def _make_audit(self, tx_id="tx-1", ts="2026-02-22T10:00:00Z"):
         return AuditEntry(
             transaction_id=tx_id,
-            timestamp=datetime.fromisoformat(ts.replace("Z", "+00:00")),
+            timestamp=parse_ts(ts),
             request=TransactionRequest(
                 sender_name="A", recipient_name="B", amount=100,
                 currency="USD", destination_country="US",
-                timestamp=datetime.fromisoformat(ts.replace("Z", "+00:00")),
+                timestamp=parse_ts(ts),
             ),
             decision="APPROVED",
             risk_score=0,
@@ -124,5 +230,52 @@ class TestMemoryStoreAudit:
         assert len(results) == 1
         assert results[0].transaction_id == "tx-1"
 
+    def test_filter_by_transaction_id_and_date(self, store):
+        store.add_audit(self._make_audit("tx-1", "2026-02-22T10:00:00Z"))
+        since = datetime(2026, 2, 22, 12, 0, tzinfo=timezone.utc)
+        assert store.get_audit_log(transaction_id="tx-1", since=since) == []
+        assert len(store.get_audit_log(transaction_id="tx-1", until=since)) == 1
+
+    def test_audit_sorted_by_timestamp(self, store):
+        store.add_audit(self._make_audit("tx-2", "2026-02-22T14:00:00Z"))
+        store.add_audit(self._make_audit("tx-1", "2026-02-22T10:00:00Z"))
+        results = store.get_audit_log()
+        assert [e.transaction_id for e in results] == ["tx-1", "tx-2"]
+
+    def test_naive_timestamp_treated_as_utc(self, store):
+        store.add_audit(self._make_audit("tx-1", "2026-02-22T10:00:00Z"))
+        store.add_audit(self._make_audit("tx-2", "2026-02-22T14:00:00"))
+        since = datetime(2026, 2, 22, 12, 0, tzinfo=timezone.utc)
+        results = store.get_audit_log(since=since)
+        assert [e.transaction_id for e in results] == ["tx-2"]
+
     def test_empty_audit_log(self, store):
         assert store.get_audit_log() == []
+
+    def test_audit_limit_keeps_newest(self):
+        store = MemoryStore(audit_limit=2)
+        for hour in (10, 11, 12, 13):
+            store.add_audit(self._make_audit(f"tx-{hour}", f"2026-02-22T{hour}:00:00Z"))
+        assert [e.transaction_id for e in store.get_audit_log()] == ["tx-12", "tx-13"]
+        assert store.get_audit_log(transaction_id="tx-10") == []
+        assert len(store.get_audit_log(transaction_id="tx-13")) == 1
+
+    def test_audit_limit_evicts_in_arrival_order(self):
+        # A backdated entry is the newest arrival, so it is kept over
+        # older arrivals with later timestamps
+        store = MemoryStore(audit_limit=2)
+        store.add_audit(self._make_audit("tx-12", "2026-02-22T12:00:00Z"))
+        store.add_audit(self._make_audit("tx-13", "2026-02-22T13:00:00Z"))
+        store.add_audit(self._make_audit("tx-14", "2026-02-22T14:00:00Z"))
+        store.add_audit(self._make_audit("tx-10", "2026-02-22T10:00:00Z"))
+        assert [e.transaction_id for e in store.get_audit_log()] == ["tx-10", "tx-14"]
+        assert len(store.get_audit_log(transaction_id="tx-10")) == 1
+        assert store.get_audit_log(transaction_id="tx-12") == []
+
+    def test_audit_limit_evicts_future_dated_entry(self):
+        store = MemoryStore(audit_limit=2)
+        store.add_audit(self._make_audit("tx-future", "2030-01-01T00:00:00Z"))
+        store.add_audit(self._make_audit("tx-1", "2026-02-22T10:00:00Z"))
+        store.add_audit(self._make_audit("tx-2", "2026-02-22T11:00:00Z"))
+        assert [e.transaction_id for e in store.get_audit_log()] == ["tx-1", "tx-2"]
+        assert store.get_audit_log(transaction_id="tx-future") == []
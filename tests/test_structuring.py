@@ -1,5 +1,6 @@
 """Tests for the structuring detection rule."""
 
+from datetime import datetime, timezone
 from app.screening.rules.structuring import check_structuring
 from tests.conftest import make_stored
 
@@ -7,14 +8,12 @@ from tests.conftest import make_stored
 class TestCheckStructuring:
     def test_no_history_no_flag(self, store):
         """Single transaction cannot be structuring."""
-        from datetime import datetime, timezone
         ts = datetime(2026, 2, 22, 16, 10, tzinfo=timezone.utc)
         result = check_structuring("Sender", 500.0, store, ts)
         assert result.score_delta == 0
 
     def test_two_similar_not_enough(self, store):
         """2 similar amounts (1 stored + 1 current) < min_count=3."""
-        from datetime import datetime, timezone
         store.add(make_stored(sender="Sender", amount=500.0, timestamp="2026-02-22T16:00:00Z", tx_id="tx-1"))
         ts = datetime(2026, 2, 22, 16, 10, tzinfo=timezone.utc)
         result = check_structuring("Sender", 490.0, store, ts)
@@ -22,7 +21,6 @@ class TestCheckStructuring:
 
     def test_three_similar_triggers(self, store):
         """3 similar amounts (2 stored + 1 current) = min_count=3."""
-        from datetime import datetime, timezone
         store.add(make_stored(sender="Sender", amount=500.0, timestamp="2026-02-22T16:00:00Z", tx_id="tx-1"))
         store.add(make_stored(sender="Sender", amount=490.0, timestamp="2026-02-22T16:05:00Z", tx_id="tx-2"))
         ts = datetime(2026, 2, 22, 16, 10, tzinfo=timezone.utc)
@@ -32,7 +30,6 @@ class TestCheckStructuring:
 
     def test_five_similar_triggers(self, store):
         """Classic structuring: 5 x ~$500 in 25 minutes."""
-        from datetime import datetime, timezone
         amounts_ts = [
             (490.0, "2026-02-22T16:00:00Z"),
             (500.0, "2026-02-22T16:06:00Z"),
@@ -48,7 +45,6 @@ class TestCheckStructuring:
 
     def test_dissimilar_amounts_no_flag(self, store):
         """Amounts that vary by more than 20% should not cluster."""
-        from datetime import datetime, timezone
         store.add(make_stored(sender="Sender", amount=100.0, timestamp="2026-02-22T16:00:00Z", tx_id="tx-1"))
         store.add(make_stored(sender="Sender", amount=500.0, timestamp="2026-02-22T16:05:00Z", tx_id="tx-2"))
         ts = datetime(2026, 2, 22, 16, 10, tzinfo=timezone.utc)
@@ -57,7 +53,6 @@ class TestCheckStructuring:
 
     def test_outside_window_not_counted(self, store):
         """Transactions older than 30 minutes should be excluded."""
-        from datetime import datetime, timezone
         store.add(make_stored(sender="Sender", amount=500.0, timestamp="2026-02-22T15:00:00Z", tx_id="tx-1"))
         store.add(make_stored(sender="Sender", amount=490.0, timestamp="2026-02-22T15:05:00Z", tx_id="tx-2"))
         ts = datetime(2026, 2, 22, 16, 10, tzinfo=timezone.utc)
@@ -66,7 +61,6 @@ class TestCheckStructuring:
 
     def test_different_sender_not_counted(self, store):
         """Only the target sender's transactions should be checked."""
-        from datetime import datetime, timezone
         store.add(make_stored(sender="Other", amount=500.0, timestamp="2026-02-22T16:00:00Z", tx_id="tx-1"))
         store.add(make_stored(sender="Other", amount=490.0, timestamp="2026-02-22T16:05:00Z", tx_id="tx-2"))
         ts = datetime(2026, 2, 22, 16, 10, tzinfo=timezone.utc)
@@ -75,7 +69,6 @@ class TestCheckStructuring:
 
     def test_custom_min_count(self, store):
         """With min_count=2, two similar amounts should trigger."""
-        from datetime import datetime, timezone
         store.add(make_stored(sender="Sender", amount=500.0, timestamp="2026-02-22T16:00:00Z", tx_id="tx-1"))
         ts = datetime(2026, 2, 22, 16, 10, tzinfo=timezone.utc)
         result = check_structuring("Sender", 490.0, store, ts, min_count=2)
@@ -83,7 +76,6 @@ class TestCheckStructuring:
 
     def test_custom_variance(self, store):
         """With variance=0.05 (5%), $500 and $600 should NOT cluster."""
-        from datetime import datetime, timezone
         store.add(make_stored(sender="Sender", amount=500.0, timestamp="2026-02-22T16:00:00Z", tx_id="tx-1"))
         store.add(make_stored(sender="Sender", amount=600.0, timestamp="2026-02-22T16:05:00Z", tx_id="tx-2"))
         ts = datetime(2026, 2, 22, 16, 10, tzinfo=timezone.utc)
@@ -92,7 +84,6 @@ class TestCheckStructuring:
 
     def test_amounts_at_boundary_of_20_percent(self, store):
         """$500 and $400 differ by 20% of $500 — should be on the boundary."""
-        from datetime import datetime, timezone
         store.add(make_stored(sender="Sender", amount=500.0, timestamp="2026-02-22T16:00:00Z", tx_id="tx-1"))
         store.add(make_stored(sender="Sender", amount=400.0, timestamp="2026-02-22T16:05:00Z", tx_id="tx-2"))
         ts = datetime(2026, 2, 22, 16, 10, tzinfo=timezone.utc)
@@ -101,11 +92,35 @@ class TestCheckStructuring:
         # All three cluster around 480: 400, 480, 500 — all within ±20% of 480
         assert result.score_delta == 50
 
+    def test_amounts_exactly_20_percent_from_center(self, store):
+        """$80.80 and $121.20 are exactly ±20% of $101 and must cluster with it."""
+        store.add(make_stored(sender="Sender", amount=80.80, timestamp="2026-02-22T16:00:00Z", tx_id="tx-1"))
+        store.add(make_stored(sender="Sender", amount=121.20, timestamp="2026-02-22T16:05:00Z", tx_id="tx-2"))
+        ts = datetime(2026, 2, 22, 16, 10, tzinfo=timezone.utc)
+        result = check_structuring("Sender", 101.0, store, ts)
+        assert result.score_delta == 50
+        assert any("3 transactions" in r for r in result.reasons)
+
     def test_reason_includes_amount_and_count(self, store):
-        from datetime import datetime, timezone
         store.add(make_stored(sender="S", amount=500.0, timestamp="2026-02-22T16:00:00Z", tx_id="tx-1"))
         store.add(make_stored(sender="S", amount=490.0, timestamp="2026-02-22T16:05:00Z", tx_id="tx-2"))
         ts = datetime(2026, 2, 22, 16, 10, tzinfo=timezone.utc)
         result = check_structuring("S", 510.0, store, ts)
         assert any("3 transactions" in r for r in result.reasons)
         assert any("$" in r for r in result.reasons)
+
+    def test_non_finite_amounts_do_not_raise(self, store):
+        store.add(make_stored(sender="S", amount=500.0, timestamp="2026-02-22T16:00:00Z", tx_id="tx-1"))
+        store.add(make_stored(sender="S", amount=490.0, timestamp="2026-02-22T16:05:00Z", tx_id="tx-2"))
+        ts = datetime(2026, 2, 22, 16, 10, tzinfo=timezone.utc)
+        for amount in (float("inf"), float("nan"), 1e307):
+            assert check_structuring("S", amount, store, ts).score_delta == 0
+
+    def test_non_finite_history_still_clusters(self, store):
+        store.add(make_stored(sender="S", amount=float("inf"), timestamp="2026-02-22T16:00:00Z", tx_id="tx-1"))
+        store.add(make_stored(sender="S", amount=500.0, timestamp="2026-02-22T16:02:00Z", tx_id="tx-2"))
+        store.add(make_stored(sender="S", amount=490.0, timestamp="2026-02-22T16:05:00Z", tx_id="tx-3"))
+        ts = datetime(2026, 2, 22, 16, 10, tzinfo=timezone.utc)
+        result = check_structuring("S", 510.0, store, ts)
+        assert result.score_delta == 50
+        assert any("3 transactions" in r for r in result.reasons)
@@ -1,5 +1,6 @@
 """Tests for the transaction velocity rule."""
 
+from datetime import datetime, timezone
 from app.screening.rules.velocity import check_velocity
 from tests.conftest import make_stored
 
@@ -7,16 +8,14 @@ from tests.conftest import make_stored
 class TestCheckVelocity:
     def test_no_history_no_flag(self, store):
         """First transaction from a sender should not trigger velocity."""
-        from datetime import datetime, timezone
         ts = datetime(2026, 2, 22, 12, 0, tzinfo=timezone.utc)
         result = check_velocity("New Sender", store, ts)
         # count = 0 + 1 (current) = 1, threshold = 5
         assert result.score_delta == 0
-        assert result.matched_rules == []
+        assert result.matched_rules == ()
 
     def test_under_threshold(self, store):
         """4 stored + 1 current = 5, which is NOT > 5."""
-        from datetime import datetime, timezone
         for i in range(4):
             store.add(make_stored(
                 sender="Test User",
@@ -29,7 +28,6 @@ class TestCheckVelocity:
 
     def test_at_threshold_triggers(self, store):
         """5 stored + 1 current = 6, which IS > 5."""
-        from datetime import datetime, timezone
         for i in range(5):
             store.add(make_stored(
                 sender="Test User",
@@ -44,7 +42,6 @@ class TestCheckVelocity:
 
     def test_well_over_threshold(self, store):
         """10 stored + 1 current = 11."""
-        from datetime import datetime, timezone
         for i in range(10):
             store.add(make_stored(
                 sender="Busy Sender",
@@ -58,7 +55,6 @@ class TestCheckVelocity:
 
     def test_outside_window_not_counted(self, store):
         """Transactions older than 60 minutes should not count."""
-        from datetime import datetime, timezone
         for i in range(6):
             store.add(make_stored(
                 sender="Old Sender",
@@ -71,7 +67,6 @@ class TestCheckVelocity:
 
     def test_different_sender_not_counted(self, store):
         """Transactions from other senders should not affect velocity."""
-        from datetime import datetime, timezone
         for i in range(6):
             store.add(make_stored(
                 sender="Other Person",
@@ -84,7 +79,6 @@ class TestCheckVelocity:
 
     def test_custom_threshold(self, store):
         """Custom threshold of 2: 2 stored + 1 current = 3 > 2."""
-        from datetime import datetime, timezone
         for i in range(2):
             store.add(make_stored(
                 sender="Test",
@@ -97,7 +91,6 @@ class TestCheckVelocity:
 
     def test_custom_window(self, store):
         """Custom window of 10 minutes — older txns excluded."""
-        from datetime import datetime, timezone
         for i in range(6):
             store.add(make_stored(
                 sender="Test",
@@ -111,7 +104,6 @@ class TestCheckVelocity:
 
     def test_case_insensitive_sender(self, store):
         """Sender lookup should be case-insensitive."""
-        from datetime import datetime, timezone
         for i in range(5):
             store.add(make_stored(
                 sender="John Smith",